@@ -0,0 +1,159 @@
+# Benchmarks de las rutas críticas de stock y pedidos, sin interfaz gráfica.
+#
+#   python benchmarks/bench_restaurante.py --escalas 10,1000,100000 --salida resultados.json
+#
+# Los resultados salen en JSON (un registro por caso y escala) para poder
+# compararlos entre versiones antes de cada despliegue.
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restaurante import Ingrediente, Menu, Pedido, Stock  # noqa: E402
+
+ESCALAS = (10, 1_000, 100_000, 1_000_000)
+# Una receta real rara vez tiene más ingredientes que esto
+MAX_INGREDIENTES_RECETA = 10
+
+
+def _stock_con(n):
+    stock = Stock()
+    for i in range(n):
+        stock.agregar_ingrediente(Ingrediente(f"ingrediente {i}", 1_000_000))
+    return stock
+
+
+def _receta(n):
+    return {f"ingrediente {i}": 1 for i in range(min(n, MAX_INGREDIENTES_RECETA))}
+
+
+def _pedido_con(n):
+    pedido = Pedido()
+    menus = [Menu(f"menu {i}", 1000 + i, {}) for i in range(n)]
+    for menu in menus:
+        pedido.agregar_menu(menu)
+    return pedido, menus
+
+
+# Cada caso recibe la escala y devuelve (preparar, ejecutar, operaciones).
+# preparar arma el estado fuera de la medición; ejecutar recibe ese estado.
+
+def caso_es_preparable(n):
+    stock = _stock_con(n)
+    menu = Menu("menu", 1000, _receta(n))
+    return (lambda: None), (lambda _: [menu.es_preparable(stock) for _ in range(n)]), n
+
+
+def caso_preparar(n):
+    menu = Menu("menu", 1000, _receta(n))
+    return (lambda: _stock_con(n)), (lambda stock: [menu.preparar(stock) for _ in range(n)]), n
+
+
+def caso_agregar_ingrediente(n):
+    ingredientes = [Ingrediente(f"ingrediente {i}", 5) for i in range(n)]
+
+    def ejecutar(stock):
+        for ingrediente in ingredientes:
+            stock.agregar_ingrediente(ingrediente)
+
+    return Stock, ejecutar, n
+
+
+def caso_pedido_total(n):
+    pedido, _ = _pedido_con(n)
+    lecturas = 10_000
+    return (lambda: None), (lambda _: [pedido.total() for _ in range(lecturas)]), lecturas
+
+
+def caso_pedido_eliminar_menu(n):
+    def ejecutar(estado):
+        pedido, menus = estado
+        for menu in menus:
+            pedido.eliminar_menu(menu)
+
+    return (lambda: _pedido_con(n)), ejecutar, n
+
+
+def caso_generar_boleta(n):
+    pedido, _ = _pedido_con(n)
+    archivo = os.path.join(tempfile.gettempdir(), "bench_boleta.pdf")
+    return (lambda: None), (lambda _: pedido.generar_boleta(archivo)), 1
+
+
+CASOS = {
+    "Menu.es_preparable": caso_es_preparable,
+    "Menu.preparar": caso_preparar,
+    "Stock.agregar_ingrediente": caso_agregar_ingrediente,
+    "Pedido.total": caso_pedido_total,
+    "Pedido.eliminar_menu": caso_pedido_eliminar_menu,
+    "Pedido.generar_boleta": caso_generar_boleta,
+}
+
+
+def medir(caso, escala, repeticiones):
+    preparar, ejecutar, operaciones = CASOS[caso](escala)
+    tiempos = []
+    for _ in range(repeticiones):
+        estado = preparar()
+        inicio = time.perf_counter()
+        ejecutar(estado)
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        "caso": caso,
+        "escala": escala,
+        "repeticiones": repeticiones,
+        "operaciones": operaciones,
+        "mejor_s": min(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        "ns_por_operacion": min(tiempos) / operaciones * 1e9,
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de stock y pedidos")
+    parser.add_argument("--escalas", default=",".join(str(e) for e in ESCALAS),
+                        help="tamaños separados por coma (ítems de stock o líneas de pedido)")
+    parser.add_argument("--casos", default=",".join(CASOS), help="casos a medir, separados por coma")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--max-boleta", type=int, default=10_000,
+                        help="escala máxima para generar_boleta (FPDF es lento con pedidos enormes)")
+    parser.add_argument("--salida", help="archivo JSON de salida; por defecto se escribe en pantalla")
+    opciones = parser.parse_args(argumentos)
+
+    escalas = [int(e) for e in opciones.escalas.split(",")]
+    resultados = []
+    for caso in opciones.casos.split(","):
+        for escala in escalas:
+            if caso == "Pedido.generar_boleta" and escala > opciones.max_boleta:
+                continue
+            try:
+                resultado = medir(caso, escala, opciones.repeticiones)
+            except ImportError as error:
+                # Por ejemplo, FPDF no instalado: se anota y se sigue con el resto
+                resultado = {"caso": caso, "escala": escala, "omitido": str(error)}
+            resultados.append(resultado)
+            print(json.dumps(resultado, ensure_ascii=False), file=sys.stderr)
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -244,5 +244,6 @@ class Aplicacion(CTk):
         self.pedido.generar_boleta()
         messagebox.showinfo("Éxito", "Boleta generada exitosamente")
 
-app = Aplicacion()
-app.mainloop()
+if __name__ == "__main__":
+    app = Aplicacion()
+    app.mainloop()
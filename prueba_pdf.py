@@ -249,5 +249,6 @@ class Aplicacion(CTk):
         self.notebook.select(self.tab_pedido)
 
 # Crear la instancia de la aplicación
-app = Aplicacion()
-app.mainloop()
+if __name__ == "__main__":
+    app = Aplicacion()
+    app.mainloop()
@@ -0,0 +1,48 @@
+# Núcleo del restaurante: se puede importar sin abrir ventanas ni cargar Tk.
+# La interfaz gráfica vive en restaurante.gui y solo se carga al ejecutarla.
+# El servidor (asyncio), el diario y el libro de ventas (sqlite3) se cargan
+# recién cuando se usan, así importar los modelos sigue siendo barato.
+from importlib import import_module
+
+from restaurante import metricas
+from restaurante.boleta import (
+    FORMATOS, DatosBoleta, GeneradorBoletas, LineaBoleta, escpos_boleta, generar_lote, generar_pdf, guardar_boleta,
+    html_boleta, nombre_boleta, registrar_formato, renderizar_boleta, texto_boleta,
+)
+from restaurante.catalogo import RUTA_MENUS, Catalogo
+from restaurante.dinero import IVA_PORCENTAJE, calcular_iva, formatear, pesos
+from restaurante.disponibilidad import Disponibilidad
+from restaurante.importacion import importar_manifiesto, leer_manifiesto
+from restaurante.modelos import TASA_IVA, Ingrediente, Receta, Menu, Stock, Reserva, LineaPedido, Pedido, Totales
+from restaurante.pronostico import Pronostico, Proyeccion
+from restaurante.sesiones import GestorSesiones, PedidoArchivado, Sesion
+
+__all__ = [
+    "metricas",
+    "FORMATOS", "DatosBoleta", "GeneradorBoletas", "LineaBoleta", "escpos_boleta", "generar_lote", "generar_pdf",
+    "guardar_boleta", "html_boleta", "nombre_boleta", "registrar_formato", "renderizar_boleta", "texto_boleta",
+    "RUTA_MENUS", "Catalogo",
+    "IVA_PORCENTAJE", "calcular_iva", "formatear", "pesos",
+    "Disponibilidad",
+    "importar_manifiesto", "leer_manifiesto",
+    "TASA_IVA", "Ingrediente", "Receta", "Menu", "Stock", "Reserva", "LineaPedido", "Pedido", "Totales",
+    "RUTA_BASE_DATOS", "Diario",
+    "Pronostico", "Proyeccion",
+    "Servidor",
+    "GestorSesiones", "PedidoArchivado", "Sesion",
+    "LibroVentas",
+]
+
+_PEREZOSOS = {
+    "RUTA_BASE_DATOS": "restaurante.persistencia",
+    "Diario": "restaurante.persistencia",
+    "Servidor": "restaurante.servidor",
+    "LibroVentas": "restaurante.ventas",
+}
+
+
+def __getattr__(nombre):
+    modulo = _PEREZOSOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    return getattr(import_module(modulo), nombre)
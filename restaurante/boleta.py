@@ -0,0 +1,255 @@
+import html
+import itertools
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+from restaurante.dinero import formatear
+from restaurante.metricas import contar, medido
+
+LineaBoleta = namedtuple("LineaBoleta", ["nombre", "cantidad", "precio", "subtotal"])
+DatosBoleta = namedtuple("DatosBoleta", ["lineas", "totales"])
+
+_contador_boletas = itertools.count(1)
+
+
+def nombre_boleta(prefijo="boleta", extension=".pdf"):
+    # Nombre único por boleta para que varias boletas en cola no se pisen
+    marca = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{prefijo}_{marca}_{next(_contador_boletas):04d}{extension}"
+
+
+# Plantilla fija de la boleta: se arma una sola vez y se reutiliza en cada página
+SEPARADOR = "================================="
+ENCABEZADO = (
+    "Restaurante XYZ",
+    "RUT: 99.999.999-9",
+    "Dirección: Calle Falsa 123",
+    "Teléfono: +56 9 9999 9999",
+    SEPARADOR,
+)
+COLUMNAS = (("Menú", 100), ("Cantidad", 40), ("Precio", 50))
+# Caracteres por línea de las impresoras térmicas de 58 mm (42 en las de 80 mm)
+ANCHO_58MM = 32
+ANCHO_80MM = 42
+
+
+def _nuevo_pdf():
+    from fpdf import FPDF  # Se importa aquí para no cargar FPDF al importar el paquete
+
+    pdf = FPDF()
+    pdf.set_font("Arial", size=12)
+    return pdf
+
+
+def _dibujar_boleta(pdf, datos):
+    pdf.add_page()
+
+    # Información del restaurante
+    for texto in ENCABEZADO:
+        pdf.cell(200, 10, txt=texto, ln=True, align="C")
+
+    # Tabla de pedidos
+    for indice, (titulo, ancho) in enumerate(COLUMNAS):
+        pdf.cell(ancho, 10, txt=titulo, border=1, ln=indice == len(COLUMNAS) - 1)
+
+    for linea in datos.lineas:
+        pdf.cell(100, 10, txt=linea.nombre, border=1)
+        pdf.cell(40, 10, txt=str(linea.cantidad), border=1)
+        pdf.cell(50, 10, txt=formatear(linea.subtotal), border=1, ln=True)
+
+    # Cálculos de total, IVA y subtotal
+    subtotal, iva, total = datos.totales
+
+    pdf.cell(200, 10, txt=SEPARADOR, ln=True, align="C")
+    pdf.cell(200, 10, txt=f"Subtotal: {formatear(subtotal)}", ln=True)
+    pdf.cell(200, 10, txt=f"IVA (19%): {formatear(iva)}", ln=True)
+    pdf.cell(200, 10, txt=f"Total: {formatear(total)}", ln=True)
+
+
+@medido("boleta.generar_pdf")
+def generar_pdf(datos, archivo_pdf="boleta.pdf"):
+    pdf = _nuevo_pdf()
+    _dibujar_boleta(pdf, datos)
+    pdf.output(archivo_pdf)
+    contar("boletas")
+
+
+@lru_cache(maxsize=None)
+def _encabezado_texto(ancho):
+    return [texto.center(ancho).rstrip() for texto in ENCABEZADO[:-1]] + ["=" * ancho]
+
+
+def _lineas_texto(datos, ancho):
+    # Boleta en columnas de ancho fijo: encabezado, líneas y totales
+    lineas = list(_encabezado_texto(ancho))
+    for linea in datos.lineas:
+        detalle = f"{linea.cantidad} x {formatear(linea.precio)}"
+        importe = formatear(linea.subtotal)
+        lineas.append(linea.nombre[:ancho])
+        lineas.append(detalle + importe.rjust(ancho - len(detalle)))
+    lineas.append("-" * ancho)
+    subtotal, iva, total = datos.totales
+    for titulo, valor in (("Subtotal", subtotal), ("IVA (19%)", iva), ("Total", total)):
+        monto = formatear(valor)
+        lineas.append(titulo + monto.rjust(ancho - len(titulo)))
+    return lineas
+
+
+def texto_boleta(datos, ancho=ANCHO_58MM):
+    return "\n".join(_lineas_texto(datos, ancho)) + "\n"
+
+
+# Comandos ESC/POS: iniciar, tabla de caracteres PC858 (con tildes y ñ),
+# centrar, negrita, y avanzar el papel y cortar
+ESC_INICIAR = b"\x1b@\x1bt\x13"
+ESC_CENTRAR, ESC_IZQUIERDA = b"\x1ba\x01", b"\x1ba\x00"
+ESC_NEGRITA, ESC_NORMAL = b"\x1bE\x01", b"\x1bE\x00"
+ESC_CORTAR = b"\x1dVA\x03"
+
+
+def escpos_boleta(datos, ancho=ANCHO_58MM):
+    # Bytes listos para enviar a una impresora térmica
+    lineas = _lineas_texto(datos, ancho)
+    # El encabezado se centra con el comando de la impresora, no con espacios
+    n_encabezado = len(ENCABEZADO) - 1
+    encabezado = "\n".join(linea.strip() for linea in lineas[:n_encabezado])
+    cuerpo = "\n".join(lineas[n_encabezado:-1])
+    return b"".join((
+        ESC_INICIAR, ESC_CENTRAR, ESC_NEGRITA, encabezado.encode("cp858", "replace"), b"\n",
+        ESC_NORMAL, ESC_IZQUIERDA, cuerpo.encode("cp858", "replace"), b"\n",
+        ESC_NEGRITA, lineas[-1].encode("cp858", "replace"), b"\n", ESC_NORMAL, ESC_CORTAR,
+    ))
+
+
+def html_boleta(datos):
+    filas = "".join(
+        f"<tr><td>{html.escape(linea.nombre)}</td><td>{linea.cantidad}</td><td>{formatear(linea.subtotal)}</td></tr>"
+        for linea in datos.lineas
+    )
+    subtotal, iva, total = datos.totales
+    encabezado = "".join(f"<p>{html.escape(texto)}</p>" for texto in ENCABEZADO[:-1])
+    columnas = "".join(f"<th>{html.escape(titulo)}</th>" for titulo, _ in COLUMNAS)
+    return (
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>Boleta</title></head><body>'
+        f"<header>{encabezado}</header><table><tr>{columnas}</tr>{filas}</table>"
+        f"<p>Subtotal: {formatear(subtotal)}</p><p>IVA (19%): {formatear(iva)}</p><p><b>Total: {formatear(total)}</b></p>"
+        "</body></html>\n"
+    )
+
+
+# Formatos de boleta además del PDF: nombre -> (extensión, función que recibe
+# DatosBoleta y devuelve str o bytes). Se pueden sumar otros con registrar_formato.
+FORMATOS = {
+    "texto": (".txt", texto_boleta),
+    "escpos": (".bin", escpos_boleta),
+    "html": (".html", html_boleta),
+}
+
+
+def registrar_formato(nombre, extension, funcion):
+    FORMATOS[nombre] = (extension, funcion)
+
+
+def extension_formato(formato):
+    if formato == "pdf":
+        return ".pdf"
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de boleta desconocido: {formato}")
+    return FORMATOS[formato][0]
+
+
+def renderizar_boleta(datos, formato="texto"):
+    # Boleta en memoria, por ejemplo para mandarla directo a la impresora.
+    # El PDF no está aquí: se escribe a archivo con guardar_boleta.
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de boleta sin salida en memoria: {formato}")
+    return FORMATOS[formato][1](datos)
+
+
+@medido("boleta.guardar")
+def guardar_boleta(datos, archivo, formato="pdf"):
+    if formato == "pdf":
+        generar_pdf(datos, archivo)
+        return
+    contenido = renderizar_boleta(datos, formato)
+    if isinstance(contenido, str):
+        with open(archivo, "w", encoding="utf-8") as salida:
+            salida.write(contenido)
+    else:
+        with open(archivo, "wb") as salida:
+            salida.write(contenido)
+    contar("boletas")
+
+
+def generar_lote(boletas, directorio=".", prefijo="boleta", primer_numero=1,
+                 archivo_unico=None, procesos=None, tamano_bloque=100):
+    # Genera muchas boletas de una vez, por ejemplo al cierre del día. Acepta
+    # pedidos o DatosBoleta. Con archivo_unico se escribe un solo PDF con una
+    # página por boleta; si no, un archivo numerado por boleta, repartidos en
+    # bloques entre varios procesos. Devuelve las rutas escritas.
+    datos = [b if isinstance(b, DatosBoleta) else b.datos_boleta() for b in boletas]
+
+    if archivo_unico is not None:
+        pdf = _nuevo_pdf()
+        for d in datos:
+            _dibujar_boleta(pdf, d)
+        ruta = os.path.join(directorio, archivo_unico)
+        pdf.output(ruta)
+        return [ruta]
+
+    # El número de lote evita que dos lotes del mismo segundo se pisen; lo que
+    # ya exista en disco (por ejemplo de otro proceso) no se sobrescribe
+    marca = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(_contador_boletas):04d}"
+    archivos = [
+        os.path.join(directorio, f"{prefijo}_{marca}_{numero:06d}.pdf")
+        for numero in range(primer_numero, primer_numero + len(datos))
+    ]
+    existentes = [archivo for archivo in archivos if os.path.exists(archivo)]
+    if existentes:
+        raise FileExistsError(f"La boleta {existentes[0]} ya existe")
+    trabajos = list(zip(datos, archivos))
+    bloques = [trabajos[i:i + tamano_bloque] for i in range(0, len(trabajos), tamano_bloque)]
+
+    if procesos == 1 or len(bloques) <= 1:
+        for bloque in bloques:
+            _generar_bloque(bloque)
+    else:
+        # Se importa aquí: cargar multiprocessing es caro y solo lo usan los lotes grandes
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            # list() para que los errores de los procesos se propaguen aquí
+            list(executor.map(_generar_bloque, bloques))
+    return archivos
+
+
+def _generar_bloque(trabajos):
+    for datos, archivo_pdf in trabajos:
+        generar_pdf(datos, archivo_pdf)
+
+
+class GeneradorBoletas:
+    # Genera las boletas en hilos de trabajo para no bloquear la interfaz.
+    # al_terminar recibe el Future y se ejecuta en el hilo de trabajo.
+    def __init__(self, max_hilos=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="boleta")
+
+    def encolar(self, pedido, archivo=None, al_terminar=None, formato="pdf"):
+        # Los datos se copian aquí, en el hilo que llama, antes de pasar al hilo de trabajo
+        datos = pedido.datos_boleta()
+        archivo = archivo or nombre_boleta(extension=extension_formato(formato))
+        futuro = self._executor.submit(_generar_y_devolver, datos, archivo, formato)
+        if al_terminar is not None:
+            futuro.add_done_callback(al_terminar)
+        return futuro
+
+    def cerrar(self, esperar=True):
+        self._executor.shutdown(wait=esperar)
+
+
+def _generar_y_devolver(datos, archivo, formato):
+    guardar_boleta(datos, archivo, formato)
+    return archivo
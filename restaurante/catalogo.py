@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+
+from restaurante.modelos import MAX_CANTIDAD_RECETA, Menu
+
+RUTA_MENUS = os.path.join(os.path.dirname(__file__), "menus.json")
+
+
+class Catalogo:
+    # Menús disponibles con índices por nombre y por ingrediente. El índice por
+    # ingrediente dice qué menús hay que revisar cuando cambia el stock de uno.
+    def __init__(self, menus=()):
+        self.menus = []
+        # Nombres en minúsculas, en el mismo orden que menus, para filtrar por texto
+        self._textos = []
+        self._por_nombre = {}
+        self._por_ingrediente = {}
+        for menu in menus:
+            self.agregar(menu)
+
+    def agregar(self, menu):
+        if menu.nombre in self._por_nombre:
+            raise ValueError(f"El menú {menu.nombre} ya está en el catálogo")
+        self.menus.append(menu)
+        self._textos.append(menu.nombre.lower())
+        self._por_nombre[menu.nombre] = menu
+        for ingrediente in menu.ingredientes:
+            self._por_ingrediente.setdefault(ingrediente, []).append(menu)
+
+    def buscar(self, nombre):
+        return self._por_nombre.get(nombre)
+
+    def filtrar(self, texto):
+        # Menús cuyo nombre contiene el texto, en el orden del catálogo
+        texto = texto.strip().lower()
+        if not texto:
+            return list(self.menus)
+        return [menu for menu, nombre in zip(self.menus, self._textos) if texto in nombre]
+
+    def menus_con_ingrediente(self, ingrediente):
+        return self._por_ingrediente.get(ingrediente, [])
+
+    def menus_afectados(self, ingredientes):
+        # Menús cuya receta usa al menos uno de los ingredientes dados
+        afectados = {}
+        for ingrediente in ingredientes:
+            for menu in self._por_ingrediente.get(ingrediente, ()):
+                afectados[menu.nombre] = menu
+        return list(afectados.values())
+
+    def __iter__(self):
+        return iter(self.menus)
+
+    def __len__(self):
+        return len(self.menus)
+
+    def __getitem__(self, indice):
+        return self.menus[indice]
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_MENUS):
+        if ruta.lower().endswith(".csv"):
+            return cls.desde_csv(ruta)
+        return cls.desde_json(ruta)
+
+    @classmethod
+    def desde_json(cls, ruta):
+        # Lista de objetos {"nombre", "precio", "ingredientes": {nombre: cantidad}, "icono"}
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        return cls(_menu_desde_datos(d["nombre"], d["precio"], d["ingredientes"], d.get("icono")) for d in datos)
+
+    @classmethod
+    def desde_csv(cls, ruta):
+        # Columnas nombre,precio,ingredientes,icono con ingredientes como "papas:5;bebida:1"
+        with open(ruta, encoding="utf-8", newline="") as archivo:
+            filas = list(csv.DictReader(archivo))
+        menus = []
+        for fila in filas:
+            ingredientes = {}
+            for par in fila["ingredientes"].split(";"):
+                if par.strip():
+                    nombre, cantidad = par.rsplit(":", 1)
+                    ingredientes[nombre] = int(cantidad)
+            menus.append(_menu_desde_datos(fila["nombre"], fila["precio"], ingredientes, fila.get("icono") or None))
+        return cls(menus)
+
+
+def _menu_desde_datos(nombre, precio, ingredientes, icono):
+    # Los nombres de ingredientes se normalizan igual que en Ingrediente. Las
+    # cantidades son unidades enteras del stock, como las guarda Receta.
+    receta = {}
+    for ingrediente, cantidad in ingredientes.items():
+        if isinstance(cantidad, bool) or not isinstance(cantidad, int) or not 0 <= cantidad <= MAX_CANTIDAD_RECETA:
+            raise ValueError(f"Cantidad inválida de {ingrediente} en el menú {nombre}: {cantidad!r}")
+        receta[ingrediente.strip().lower()] = cantidad
+    return Menu(nombre.strip(), precio, receta, icono)
@@ -0,0 +1,38 @@
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Los montos son pesos chilenos enteros: el peso no tiene decimales, así que
+# las sumas son exactas. El IVA se redondea una sola vez, sobre el neto de todo
+# el documento, al peso más cercano y la mitad hacia arriba.
+IVA_PORCENTAJE = 19
+# "1.100" o "12.345.678": punto de miles, como los escribe formatear
+_CON_MILES = re.compile(r"-?\d{1,3}(\.\d{3})+")
+
+
+def pesos(valor):
+    # Precio de cualquier origen (int, float, Decimal o texto) a pesos enteros.
+    # En texto se acepta el formato chileno: "$1.100" son mil cien pesos y
+    # "1.100,5" lleva coma decimal. Sin coma, un punto seguido de otra cantidad
+    # de dígitos que 3 es decimal ("1990.5").
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str):
+        texto = valor.strip().replace("$", "").replace(" ", "")
+        if "," in texto:
+            texto = texto.replace(".", "").replace(",", ".")
+        elif _CON_MILES.fullmatch(texto):
+            texto = texto.replace(".", "")
+        valor = texto
+    try:
+        return int(Decimal(str(valor)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Monto inválido: {valor!r}") from None
+
+
+def calcular_iva(neto):
+    return (neto * IVA_PORCENTAJE + 50) // 100
+
+
+def formatear(monto):
+    # $18.445, con punto de miles como se escribe en Chile
+    return f"${monto:,}".replace(",", ".")
@@ -0,0 +1,77 @@
+import threading
+
+# Desde cuántos menús por recalcular conviene hacerlo con la matriz de recetas
+UMBRAL_VECTORIAL = 32
+
+
+class Disponibilidad:
+    # Cuántas porciones de cada menú alcanza a preparar el stock actual. Se
+    # mantiene al día escuchando los cambios del stock y recalculando solo los
+    # menús que usan los ingredientes que cambiaron. None significa sin límite
+    # (un menú sin ingredientes).
+    #
+    # Con numpy y un catálogo grande, los recálculos masivos (el inicial o tras
+    # una carga de guía de despacho) se hacen en una sola operación vectorial.
+    def __init__(self, catalogo, stock):
+        self.catalogo = catalogo
+        self.stock = stock
+        self._matriz = _matriz_recetas(catalogo) if len(catalogo) >= UMBRAL_VECTORIAL else None
+        self.porciones = self._calcular_todos()
+        self._suscriptores = []
+        # Los avisos del stock pueden llegar desde varios hilos a la vez
+        self._candado = threading.Lock()
+        stock.suscribir(self._stock_cambiado)
+
+    def suscribir(self, funcion):
+        # funcion recibe un dict {nombre de menú: porciones} con los que cambiaron
+        self._suscriptores.append(funcion)
+
+    def porciones_de(self, nombre):
+        return self.porciones.get(nombre, 0)
+
+    def es_preparable(self, nombre):
+        porciones = self.porciones_de(nombre)
+        return porciones is None or porciones > 0
+
+    def preparables(self):
+        return [nombre for nombre in self.porciones if self.es_preparable(nombre)]
+
+    def _calcular(self, menu):
+        porciones = None
+        for ingrediente, cantidad_necesaria in menu.ingredientes.items():
+            if cantidad_necesaria <= 0:
+                continue
+            alcanza = self.stock.get(ingrediente, 0) // cantidad_necesaria
+            if porciones is None or alcanza < porciones:
+                porciones = alcanza
+        return porciones
+
+    def _calcular_todos(self):
+        if self._matriz is None:
+            return {menu.nombre: self._calcular(menu) for menu in self.catalogo}
+        return self._matriz.porciones_por_menu(self.stock)
+
+    def _stock_cambiado(self, nombres):
+        cambios = {}
+        with self._candado:
+            afectados = self.catalogo.menus_afectados(nombres)
+            if self._matriz is not None and len(afectados) >= UMBRAL_VECTORIAL:
+                nuevas = self._calcular_todos()
+            else:
+                nuevas = {menu.nombre: self._calcular(menu) for menu in afectados}
+            for nombre, porciones in nuevas.items():
+                if porciones != self.porciones.get(nombre):
+                    self.porciones[nombre] = porciones
+                    cambios[nombre] = porciones
+        if cambios:
+            for funcion in self._suscriptores:
+                funcion(cambios)
+
+
+def _matriz_recetas(catalogo):
+    # numpy se importa recién aquí, y sin él se sigue con el cálculo por menú
+    try:
+        from restaurante.matriz import MatrizRecetas
+        return MatrizRecetas(catalogo)
+    except ImportError:
+        return None
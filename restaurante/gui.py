@@ -0,0 +1,506 @@
+import os
+import queue
+import threading
+from itertools import zip_longest
+from tkinter import ttk, messagebox, filedialog
+from customtkinter import CTk, CTkEntry, CTkButton, CTkFrame, CTkLabel
+
+from restaurante import metricas
+from restaurante.boleta import GeneradorBoletas, extension_formato
+from restaurante.catalogo import Catalogo
+from restaurante.dinero import formatear
+from restaurante.disponibilidad import Disponibilidad
+from restaurante.iconos import cargar_icono
+from restaurante.importacion import importar_manifiesto
+from restaurante.metricas import medido
+from restaurante.modelos import Ingrediente
+from restaurante.notificaciones import BarraNotificaciones
+from restaurante.persistencia import Diario
+from restaurante.pronostico import Pronostico
+from restaurante.servidor import Servidor
+from restaurante.sesiones import GestorSesiones
+
+MESA_INICIAL = "Mostrador"
+# La caja imprime en un formato liviano; el PDF se genera solo si el cliente lo pide
+FORMATO_CAJA = os.environ.get("RESTAURANTE_FORMATO_BOLETA", "texto")
+# Cada cuánto se recalculan las proyecciones de la pestaña de ingredientes
+INTERVALO_PRONOSTICO_MS = 60_000
+# Botones de menú que existen a la vez; el resto del catálogo se ve por páginas
+MENUS_POR_PAGINA = 8
+COLUMNAS_MENU = 2
+
+# Los messagebox son modales y bloquean la caja: quedan solo para los errores.
+# Se miden para ver cuánto pesan.
+showerror = medido("gui.messagebox")(messagebox.showerror)
+
+
+class Aplicacion(CTk):
+    def __init__(self):
+        super().__init__()
+        self.title("Gestión de Restaurante")
+        self.geometry("800x600")
+        # El stock se recupera del diario en disco y cada cambio queda registrado
+        self.diario = Diario()
+        self.stock = self.diario.cargar()
+        # Un pedido abierto por mesa o ticket, todos sobre el mismo stock
+        self.sesiones = GestorSesiones(self.stock)
+        self.sesiones.cambiar(MESA_INICIAL)
+        # Ritmo de consumo por ingrediente, para saber qué se acaba y cuánto pedir
+        self.pronostico = Pronostico(self.stock)
+
+        # Filas de los treeviews indexadas por nombre, y cambios pendientes de
+        # dibujar. Los cambios se aplican todos juntos en el siguiente ciclo ocioso de Tk.
+        self._filas_ingredientes = {}
+        self._filas_pedido = {}
+        self._ingredientes_pendientes = set()
+        self._pedido_pendiente = set()
+        self._refresco_programado = None
+
+        # Las boletas se generan en hilos de trabajo; sus resultados vuelven al
+        # hilo de Tk a través de esta cola, que se revisa con after().
+        self.generador_boletas = GeneradorBoletas()
+        self._boletas_terminadas = queue.Queue()
+        self._boletas_pendientes = 0
+        self.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.menus_disponibles = Catalogo.cargar()
+        self.disponibilidad = Disponibilidad(self.menus_disponibles, self.stock)
+        # Botones visibles por nombre de menú
+        self.botones_menu = {}
+
+        # El stock puede cambiar desde otros hilos (la API local). Esos avisos
+        # se encolan y se aplican en el hilo de Tk, que revisa la cola con after().
+        self._tareas_tk = queue.Queue()
+        self.stock.suscribir(self._stock_cambiado)
+        self.after(100, self._procesar_tareas_tk)
+
+        # Con RESTAURANTE_PUERTO la caja también atiende a kioscos y tablets
+        self.servidor = None
+        if os.environ.get("RESTAURANTE_PUERTO"):
+            self.servidor = Servidor(self.stock, self.menus_disponibles, self.disponibilidad, self.diario,
+                                     self.generador_boletas, self.sesiones, puerto=int(os.environ["RESTAURANTE_PUERTO"]))
+            self.servidor.iniciar_en_hilo()
+
+        # Los avisos de cada acción van a esta barra, sin bloquear la ventana.
+        # Se empaqueta antes que el notebook para que siempre quede visible.
+        self.notificaciones = BarraNotificaciones(self)
+        self.notificaciones.pack(side="bottom", fill="x", padx=10)
+
+        # Crear el notebook para las pestañas
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill="both", expand=True)
+
+        # Crear las pestañas
+        self.tab_ingredientes = CTkFrame(self.notebook)
+        self.tab_pedido = CTkFrame(self.notebook)
+
+        self.notebook.add(self.tab_ingredientes, text="Ingreso de Ingredientes")
+        self.notebook.add(self.tab_pedido, text="Pedido")
+
+        # Configurar las interfaces dentro de cada pestaña. La del pedido se
+        # arma recién la primera vez que se muestra, para abrir la ventana antes.
+        self.crear_interfaz_ingredientes()
+        self.actualizar_treeview_ingredientes()
+        self.after(INTERVALO_PRONOSTICO_MS, self._actualizar_pronostico)
+        self._interfaz_pedido_creada = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._pestaña_cambiada)
+
+    def crear_interfaz_ingredientes(self):
+        # Marco para organizar la entrada de ingredientes
+        frame_izquierdo = CTkFrame(self.tab_ingredientes)
+        frame_izquierdo.grid(row=0, column=0, padx=20, pady=20, sticky="n")
+
+        label_nombre = CTkLabel(frame_izquierdo, text="Nombre del Ingrediente:")
+        label_nombre.grid(row=0, column=0, padx=10, pady=10)
+        self.entry_nombre = CTkEntry(frame_izquierdo)
+        self.entry_nombre.grid(row=0, column=1, padx=10, pady=10)
+
+        label_cantidad = CTkLabel(frame_izquierdo, text="Cantidad:")
+        label_cantidad.grid(row=1, column=0, padx=10, pady=10)
+        self.entry_cantidad = CTkEntry(frame_izquierdo)
+        self.entry_cantidad.grid(row=1, column=1, padx=10, pady=10)
+
+        boton_ingresar = CTkButton(frame_izquierdo, text="Ingresar Ingrediente", command=self.agregar_ingrediente)
+        boton_ingresar.grid(row=2, column=0, columnspan=2, padx=10, pady=10)
+
+        boton_importar = CTkButton(frame_izquierdo, text="Importar Guía de Despacho", command=self.importar_manifiesto)
+        boton_importar.grid(row=3, column=0, columnspan=2, padx=10, pady=10)
+
+        # Treeview para mostrar los ingredientes, alineado a la derecha
+        frame_derecho = CTkFrame(self.tab_ingredientes)
+        frame_derecho.grid(row=0, column=1, padx=10, pady=20, sticky="n")
+        columnas = ("Nombre", "Cantidad", "Consumo por Hora", "Se Agota en", "Reponer")
+        self.treeview_ingredientes = ttk.Treeview(frame_derecho, columns=columnas, show="headings", height=20)
+        for columna in columnas:
+            self.treeview_ingredientes.heading(columna, text=columna)
+            self.treeview_ingredientes.column(columna, width=160 if columna == "Nombre" else 90)
+        self.treeview_ingredientes.grid(row=0, column=0, padx=10, pady=10)
+
+        # Botón para eliminar ingrediente
+        boton_eliminar = CTkButton(frame_derecho, text="Eliminar Ingrediente", command=self.eliminar_ingrediente)
+        boton_eliminar.grid(row=1, column=0, padx=10, pady=10)
+
+        # Botón para generar menú
+        boton_generar_menu = CTkButton(self.tab_ingredientes, text="Generar Menú", command=self.mostrar_pestaña_pedido)
+        boton_generar_menu.grid(row=1, column=1, padx=10, pady=10, sticky="s")
+
+    @medido("gui.crear_interfaz_pedido")
+    def crear_interfaz_pedido(self):
+        frame_superior = CTkFrame(self.tab_pedido)
+        frame_superior.pack(fill="x", padx=10, pady=5)
+
+        label_menus = CTkLabel(frame_superior, text="Menús Disponibles:")
+        label_menus.grid(row=0, column=0, padx=10, pady=5)
+        self.entry_buscar_menu = CTkEntry(frame_superior, placeholder_text="Buscar menú")
+        self.entry_buscar_menu.grid(row=0, column=1, padx=10, pady=5)
+        self.entry_buscar_menu.bind("<KeyRelease>", lambda evento: self._programar_filtro_menus())
+
+        # Solo se crean MENUS_POR_PAGINA botones, con la imagen arriba del texto.
+        # Al buscar o cambiar de página se reutilizan con otros menús.
+        self._botones_pagina = []
+        for indice in range(MENUS_POR_PAGINA):
+            boton_menu = CTkButton(frame_superior, text="", compound="top")
+            boton_menu.grid(row=1 + indice // COLUMNAS_MENU, column=indice % COLUMNAS_MENU, padx=10, pady=10)
+            self._botones_pagina.append(boton_menu)
+
+        frame_paginas = CTkFrame(frame_superior)
+        frame_paginas.grid(row=1 + MENUS_POR_PAGINA // COLUMNAS_MENU, column=0, columnspan=COLUMNAS_MENU, pady=5)
+        CTkButton(frame_paginas, text="<", width=40, command=lambda: self.cambiar_pagina_menus(-1)).pack(side="left", padx=5)
+        self.label_pagina = CTkLabel(frame_paginas, text="")
+        self.label_pagina.pack(side="left", padx=5)
+        CTkButton(frame_paginas, text=">", width=40, command=lambda: self.cambiar_pagina_menus(1)).pack(side="left", padx=5)
+
+        self._menus_filtrados = list(self.menus_disponibles)
+        self._pagina_menus = 0
+        self._filtro_programado = None
+        self.mostrar_pagina_menus()
+        self.disponibilidad.suscribir(lambda porciones: self._en_hilo_tk(self.actualizar_botones_menu, porciones))
+
+        frame_intermedio = CTkFrame(self.tab_pedido)
+        frame_intermedio.pack(fill="x", padx=10, pady=5)
+
+        self.treeview_pedido = ttk.Treeview(frame_intermedio, columns=("Nombre", "Cantidad", "Precio Unitario"), show="headings")
+        self.treeview_pedido.heading("Nombre", text="Nombre del Menú")
+        self.treeview_pedido.heading("Cantidad", text="Cantidad")
+        self.treeview_pedido.heading("Precio Unitario", text="Precio Unitario")
+        self.treeview_pedido.pack(side="left", fill="x", expand=True)
+
+        self.label_total = CTkLabel(frame_intermedio, text="Total: $0")
+        self.label_total.pack(side="right", padx=10)
+
+        boton_eliminar_menu = CTkButton(frame_intermedio, text="Eliminar Menú", command=self.eliminar_menu_del_pedido)
+        boton_eliminar_menu.pack(side="right", padx=10)
+
+        frame_inferior = CTkFrame(self.tab_pedido)
+        frame_inferior.pack(fill="x", padx=10, pady=5)
+
+        label_mesa = CTkLabel(frame_inferior, text="Mesa o Ticket:")
+        label_mesa.pack(side="left", padx=10, pady=10)
+        self.combobox_mesa = ttk.Combobox(frame_inferior, values=self.sesiones.abiertas())
+        self.combobox_mesa.set(self.sesion.clave)
+        self.combobox_mesa.pack(side="left", padx=10, pady=10)
+        self.combobox_mesa.bind("<<ComboboxSelected>>", lambda evento: self.cambiar_mesa())
+        self.combobox_mesa.bind("<Return>", lambda evento: self.cambiar_mesa())
+
+        boton_cambiar_mesa = CTkButton(frame_inferior, text="Abrir / Cambiar Mesa", command=self.cambiar_mesa)
+        boton_cambiar_mesa.pack(side="left", padx=10, pady=10)
+
+        boton_boleta_pdf = CTkButton(frame_inferior, text="Boleta PDF", command=lambda: self.generar_boleta("pdf"))
+        boton_boleta_pdf.pack(side="right", padx=10, pady=10)
+
+        boton_generar_boleta = CTkButton(frame_inferior, text="Generar Boleta", command=self.generar_boleta)
+        boton_generar_boleta.pack(side="right", padx=10, pady=10)
+
+
+    @property
+    def sesion(self):
+        # La mesa actual pudo cerrarse desde la API; en ese caso se vuelve al mostrador
+        return self.sesiones.actual or self.sesiones.cambiar(MESA_INICIAL)
+
+    @property
+    def pedido(self):
+        return self.sesion.pedido
+
+    def cambiar_mesa(self, clave=None):
+        clave = (clave or self.combobox_mesa.get()).strip()
+        if not clave:
+            return
+        self.sesiones.cambiar(clave)
+        self.combobox_mesa.configure(values=self.sesiones.abiertas())
+        self.combobox_mesa.set(clave)
+        # Las filas del pedido anterior se borran y se insertan las del nuevo
+        self.actualizar_treeview_pedido()
+        self.actualizar_total()
+
+    @medido("gui.agregar_ingrediente")
+    def agregar_ingrediente(self):
+        nombre = self.entry_nombre.get().strip().lower()
+        try:
+            cantidad = int(self.entry_cantidad.get())
+            if cantidad <= 0:
+                raise ValueError
+            self.stock.agregar_ingrediente(Ingrediente(nombre, cantidad))
+            self.notificaciones.mostrar(f"Ingrediente {nombre.capitalize()} agregado al stock")
+        except ValueError:
+            showerror("Error", "Cantidad debe ser un número entero positivo")
+
+    @medido("gui.importar_manifiesto")
+    def importar_manifiesto(self):
+        ruta = filedialog.askopenfilename(
+            title="Importar guía de despacho",
+            filetypes=[("Guías de despacho", "*.csv *.json *.jsonl"), ("Todos los archivos", "*.*")],
+        )
+        if not ruta:
+            return
+        try:
+            agregados = importar_manifiesto(self.stock, ruta)
+        except (OSError, ValueError) as error:
+            showerror("Error", f"No se pudo importar la guía: {error}")
+            return
+        self.notificaciones.mostrar(f"{len(agregados)} ingredientes actualizados desde la guía")
+
+    def _stock_cambiado(self, nombres):
+        # Cualquier cambio del stock, hecho desde la caja o desde la API
+        if nombres:
+            self._en_hilo_tk(self.actualizar_treeview_ingredientes, *nombres)
+
+    def _actualizar_pronostico(self):
+        # El consumo por hora cambia con el tiempo aunque el stock no se mueva
+        self.actualizar_treeview_ingredientes()
+        self.after(INTERVALO_PRONOSTICO_MS, self._actualizar_pronostico)
+
+    def _en_hilo_tk(self, funcion, *args):
+        if threading.current_thread() is threading.main_thread():
+            funcion(*args)
+        else:
+            self._tareas_tk.put((funcion, args))
+
+    def _procesar_tareas_tk(self):
+        while True:
+            try:
+                funcion, args = self._tareas_tk.get_nowait()
+            except queue.Empty:
+                break
+            funcion(*args)
+        self.after(100, self._procesar_tareas_tk)
+
+    def actualizar_treeview_ingredientes(self, *nombres):
+        # Sin nombres se revisan todas las filas, por ejemplo tras una carga masiva
+        if not nombres:
+            nombres = self.stock.ingredientes.keys() | self._filas_ingredientes.keys()
+        self._ingredientes_pendientes.update(nombres)
+        self._programar_refresco()
+
+    @medido("gui.eliminar_ingrediente")
+    def eliminar_ingrediente(self):
+        selected_item = self.treeview_ingredientes.selection()
+        if selected_item:
+            item = self.treeview_ingredientes.item(selected_item)
+            nombre = item["values"][0].strip().lower()
+            self.stock.eliminar_ingrediente(nombre)
+            self.notificaciones.mostrar(f"Ingrediente {nombre.capitalize()} eliminado del stock")
+        else:
+            self.notificaciones.mostrar("Seleccione un ingrediente para eliminar", "advertencia")
+
+    def mostrar_pestaña_pedido(self):
+        self.notebook.select(self.tab_pedido)
+
+    def _pestaña_cambiada(self, evento):
+        if not self._interfaz_pedido_creada and self.notebook.select() == str(self.tab_pedido):
+            self._interfaz_pedido_creada = True
+            self.crear_interfaz_pedido()
+            self.actualizar_treeview_pedido()
+            self.actualizar_total()
+
+    @medido("gui.agregar_menu_a_pedido")
+    def agregar_menu_a_pedido(self, menu):
+        try:
+            agregado = self.sesion.agregar_menu(menu)
+        except ValueError as error:
+            # La API cerró la mesa mientras tanto
+            self.notificaciones.mostrar(str(error), "advertencia")
+            return
+        if agregado:
+            self.actualizar_treeview_pedido(menu.nombre)
+            self.actualizar_total()
+            self.notificaciones.mostrar(f"Menú {menu.nombre} agregado al pedido")
+        else:
+            self.notificaciones.mostrar(f"No hay suficientes ingredientes para preparar {menu.nombre}", "advertencia")
+
+    def _programar_filtro_menus(self):
+        # Se filtra cuando se deja de escribir, no en cada tecla
+        if self._filtro_programado is not None:
+            self.after_cancel(self._filtro_programado)
+        self._filtro_programado = self.after(150, self.filtrar_menus)
+
+    def filtrar_menus(self):
+        self._filtro_programado = None
+        self._menus_filtrados = self.menus_disponibles.filtrar(self.entry_buscar_menu.get())
+        self._pagina_menus = 0
+        self.mostrar_pagina_menus()
+
+    def cambiar_pagina_menus(self, paso):
+        self._pagina_menus = max(self._pagina_menus + paso, 0)
+        self.mostrar_pagina_menus()
+
+    @medido("gui.mostrar_pagina_menus")
+    def mostrar_pagina_menus(self):
+        paginas = max(-(-len(self._menus_filtrados) // MENUS_POR_PAGINA), 1)
+        self._pagina_menus = min(self._pagina_menus, paginas - 1)
+        inicio = self._pagina_menus * MENUS_POR_PAGINA
+        visibles = self._menus_filtrados[inicio:inicio + MENUS_POR_PAGINA]
+
+        self.botones_menu = {}
+        for boton, menu in zip_longest(self._botones_pagina, visibles):
+            if menu is None:
+                boton.grid_remove()
+                continue
+            boton.configure(image=cargar_icono(menu.icono), text=f"{menu.nombre} - {formatear(menu.precio)}",
+                            command=lambda m=menu: self.agregar_menu_a_pedido(m))
+            boton.grid()
+            self.botones_menu[menu.nombre] = boton
+        self.actualizar_botones_menu({nombre: self.disponibilidad.porciones_de(nombre) for nombre in self.botones_menu})
+        self.label_pagina.configure(text=f"Página {self._pagina_menus + 1} de {paginas}")
+
+    @medido("gui.actualizar_botones_menu")
+    def actualizar_botones_menu(self, porciones):
+        # Solo se tocan los botones visibles de los menús cuya disponibilidad cambió
+        for nombre, cantidad in porciones.items():
+            boton = self.botones_menu.get(nombre)
+            if boton is not None:
+                boton.configure(state="normal" if cantidad is None or cantidad > 0 else "disabled")
+
+    @medido("gui.eliminar_menu_del_pedido")
+    def eliminar_menu_del_pedido(self):
+        selected_item = self.treeview_pedido.selection()
+        if selected_item:
+            item = self.treeview_pedido.item(selected_item)
+            menu_nombre = str(item["values"][0])
+            linea = self.pedido.buscar_linea(menu_nombre)
+            if linea:
+                menu = linea.menu
+                # Los ingredientes que se descontaron al agregarlo vuelven al stock
+                try:
+                    self.sesion.eliminar_menu(menu)
+                except ValueError as error:
+                    self.notificaciones.mostrar(str(error), "advertencia")
+                    return
+                self.actualizar_treeview_pedido(menu.nombre)
+                self.actualizar_total()
+                self.notificaciones.mostrar(f"Menú {menu.nombre} eliminado del pedido")
+        else:
+            self.notificaciones.mostrar("Seleccione un menú para eliminar", "advertencia")
+
+    def actualizar_treeview_pedido(self, *nombres):
+        if not nombres:
+            nombres = self.pedido.lineas.keys() | self._filas_pedido.keys()
+        self._pedido_pendiente.update(nombres)
+        self._programar_refresco()
+
+    def _programar_refresco(self):
+        if self._refresco_programado is None:
+            self._refresco_programado = self.after_idle(self._refrescar_treeviews)
+
+    @medido("gui.refrescar_treeviews")
+    def _refrescar_treeviews(self):
+        self._refresco_programado = None
+
+        ingredientes, self._ingredientes_pendientes = self._ingredientes_pendientes, set()
+        for nombre in ingredientes:
+            valores = None
+            if nombre in self.stock.ingredientes:
+                _, cantidad, por_hora, horas, reponer = self.pronostico.proyeccion(nombre)
+                valores = (nombre.capitalize(), cantidad, f"{por_hora:.1f}",
+                           "-" if horas is None else f"{horas:.1f} h", reponer or "")
+            self._sincronizar_fila(self.treeview_ingredientes, self._filas_ingredientes, nombre, valores)
+
+        lineas, self._pedido_pendiente = self._pedido_pendiente, set()
+        for nombre in lineas:
+            linea = self.pedido.buscar_linea(nombre)
+            valores = None if linea is None else (linea.menu.nombre, linea.cantidad, formatear(linea.menu.precio))
+            self._sincronizar_fila(self.treeview_pedido, self._filas_pedido, nombre, valores)
+
+    def _sincronizar_fila(self, treeview, filas, clave, valores):
+        # Inserta, actualiza o borra solo la fila que corresponde a la clave
+        fila = filas.get(clave)
+        if valores is None:
+            if fila is not None:
+                treeview.delete(fila)
+                del filas[clave]
+        elif fila is None:
+            filas[clave] = treeview.insert("", "end", values=valores)
+        else:
+            treeview.item(fila, values=valores)
+
+    def actualizar_total(self):
+        # El mismo total con IVA que sale en la boleta
+        totales = self.pedido.totales()
+        self.label_total.configure(text=f"Total: {formatear(totales.total)} (IVA {formatear(totales.iva)})")
+
+
+    @medido("gui.generar_boleta")
+    def generar_boleta(self, formato=FORMATO_CAJA):
+        if not self.pedido.lineas:
+            self.notificaciones.mostrar("No hay menús en el pedido para generar la boleta", "advertencia")
+            return
+        # El formato se revisa antes de registrar la venta, para no registrarla
+        # y dejar la mesa abierta si la boleta no se puede generar
+        try:
+            extension_formato(formato)
+        except ValueError as error:
+            showerror("Error", str(error))
+            return
+
+        # La mesa se cierra antes de cobrarla, así la API no puede cobrarla también
+        sesion = self.sesion
+        try:
+            self.sesiones.cerrar(sesion.clave)
+        except KeyError:
+            self.notificaciones.mostrar(f"El pedido de {sesion.clave} ya se cerró", "advertencia")
+            self.cambiar_mesa(MESA_INICIAL)
+            return
+        self.diario.registrar_pedido(sesion.pedido)
+        metricas.contar("pedidos")
+        self.generador_boletas.encolar(sesion.pedido, al_terminar=self._boletas_terminadas.put, formato=formato)
+        # La mesa queda abierta de nuevo, vacía
+        self.cambiar_mesa(sesion.clave)
+        self._boletas_pendientes += 1
+        if self._boletas_pendientes == 1:
+            self.after(100, self._revisar_boletas)
+
+    def _revisar_boletas(self):
+        while True:
+            try:
+                futuro = self._boletas_terminadas.get_nowait()
+            except queue.Empty:
+                break
+            self._boletas_pendientes -= 1
+            error = futuro.exception()
+            if error is None:
+                self.notificaciones.mostrar(f"Boleta {futuro.result()} generada exitosamente")
+            else:
+                showerror("Error", f"No se pudo generar la boleta: {error}")
+        if self._boletas_pendientes:
+            self.after(100, self._revisar_boletas)
+
+    def cerrar(self):
+        # Se espera a que terminen las boletas en cola antes de cerrar
+        if self.servidor is not None:
+            self.servidor.detener()
+        self.generador_boletas.cerrar()
+        # Los pedidos sin cobrar no sobreviven al reinicio: sus ingredientes
+        # vuelven al stock antes de la última instantánea del diario
+        self.sesiones.anular_abiertas()
+        self.diario.cerrar()
+        if metricas.esta_activo():
+            metricas.volcar()
+        self.destroy()
+
+
+def main():
+    app = Aplicacion()
+    app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
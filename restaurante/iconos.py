@@ -0,0 +1,24 @@
+import os
+from functools import lru_cache
+
+from customtkinter import CTkImage
+from PIL import Image
+
+# Los íconos están junto al programa, fuera del paquete
+DIRECTORIO_ICONOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_ICONOS = 128
+
+
+@lru_cache(maxsize=MAX_ICONOS)
+def cargar_icono(archivo, tamano=(50, 50)):
+    # Decodifica el ícono recién cuando un botón lo necesita y guarda los
+    # últimos MAX_ICONOS usados. Si el archivo no existe el botón va sin imagen.
+    if not archivo:
+        return None
+    ruta = archivo if os.path.isabs(archivo) else os.path.join(DIRECTORIO_ICONOS, archivo)
+    try:
+        with Image.open(ruta) as imagen:
+            imagen.load()
+            return CTkImage(imagen, size=tamano)
+    except OSError:
+        return None
@@ -0,0 +1,98 @@
+import csv
+import json
+import re
+
+from restaurante.modelos import Ingrediente
+
+TAMANO_BLOQUE = 64 * 1024
+_SEPARADORES = re.compile(r"[\s,]*")
+_ENTERO = re.compile(r"\s*\d+\s*")
+
+
+def importar_manifiesto(stock, ruta):
+    # Carga una guía de despacho completa al stock en un solo lote. Si alguna
+    # línea es inválida se lanza ValueError y el stock no se modifica.
+    return stock.agregar_lote(leer_manifiesto(ruta))
+
+
+def leer_manifiesto(ruta):
+    # Recorre el archivo sin cargarlo entero y entrega un Ingrediente por línea.
+    # Acepta CSV con columnas nombre,cantidad, JSON Lines o un arreglo JSON de
+    # objetos {"nombre", "cantidad"}.
+    ruta_minuscula = ruta.lower()
+    if ruta_minuscula.endswith(".csv"):
+        filas = _filas_csv(ruta)
+    elif ruta_minuscula.endswith((".jsonl", ".ndjson")):
+        filas = _filas_json_lines(ruta)
+    elif ruta_minuscula.endswith(".json"):
+        filas = _filas_json(ruta)
+    else:
+        raise ValueError(f"Formato de manifiesto no soportado: {ruta}")
+
+    # En CSV todo llega como texto; en JSON la cantidad ya debe ser un entero
+    texto = ruta_minuscula.endswith(".csv")
+    for numero, fila in filas:
+        yield _ingrediente_desde_fila(numero, fila, texto)
+
+
+def _ingrediente_desde_fila(numero, fila, texto=False):
+    try:
+        nombre = str(fila["nombre"])
+        cantidad = _cantidad(fila["cantidad"], texto)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Línea {numero}: se esperaba un nombre y una cantidad entera") from None
+    if not nombre.strip() or cantidad <= 0:
+        raise ValueError(f"Línea {numero}: la cantidad debe ser un número entero positivo")
+    # Ingrediente normaliza el nombre igual que el ingreso manual
+    return Ingrediente(nombre, cantidad)
+
+
+def _cantidad(valor, texto):
+    # Sin conversiones implícitas: int() aceptaría 2.9, true o "1_000"
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return valor
+    if texto and isinstance(valor, str) and _ENTERO.fullmatch(valor):
+        return int(valor)
+    raise ValueError(valor)
+
+
+def _filas_csv(ruta):
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        # La línea 1 es el encabezado
+        for numero, fila in enumerate(csv.DictReader(archivo), start=2):
+            yield numero, fila
+
+
+def _filas_json_lines(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        for numero, linea in enumerate(archivo, start=1):
+            if linea.strip():
+                yield numero, json.loads(linea)
+
+
+def _filas_json(ruta):
+    # Lee el arreglo por bloques y decodifica un objeto a la vez
+    decodificador = json.JSONDecoder()
+    with open(ruta, encoding="utf-8") as archivo:
+        buffer = archivo.read(TAMANO_BLOQUE).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError("El manifiesto JSON debe ser un arreglo de objetos")
+        posicion = 1
+        numero = 0
+        while True:
+            posicion = _SEPARADORES.match(buffer, posicion).end()
+            if buffer.startswith("]", posicion):
+                return
+            try:
+                objeto, posicion_final = decodificador.raw_decode(buffer, posicion)
+            except json.JSONDecodeError:
+                # El objeto quedó cortado al final del bloque: se lee el siguiente
+                bloque = archivo.read(TAMANO_BLOQUE)
+                if not bloque:
+                    raise ValueError("El manifiesto JSON está incompleto") from None
+                buffer = buffer[posicion:] + bloque
+                posicion = 0
+                continue
+            numero += 1
+            yield numero, objeto
+            posicion = posicion_final
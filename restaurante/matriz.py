@@ -0,0 +1,66 @@
+# numpy es opcional y pesado de importar: este módulo solo se carga cuando un
+# catálogo grande lo necesita (ver Disponibilidad), nunca al importar el paquete.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from restaurante.modelos import Stock
+
+# Porciones de un menú sin ingredientes: no las limita el stock
+SIN_LIMITE = np.iinfo(np.int64).max if np is not None else None
+
+
+class MatrizRecetas:
+    # Todas las recetas del catálogo como una matriz menús x ingredientes, para
+    # responder de una vez, contra un vector de stock, qué menús se pueden
+    # preparar, cuántas porciones de cada uno y si alcanza para un pedido entero.
+    def __init__(self, catalogo):
+        if np is None:
+            raise ImportError("MatrizRecetas necesita numpy")
+        self.menus = [menu.nombre for menu in catalogo]
+        self.ingredientes = sorted({ingrediente for menu in catalogo for ingrediente in menu.ingredientes})
+        self.indice_menus = {nombre: fila for fila, nombre in enumerate(self.menus)}
+        self.indice_ingredientes = {nombre: columna for columna, nombre in enumerate(self.ingredientes)}
+
+        self.recetas = np.zeros((len(self.menus), len(self.ingredientes)), dtype=np.int64)
+        for fila, menu in enumerate(catalogo):
+            for ingrediente, cantidad in menu.ingredientes.items():
+                self.recetas[fila, self.indice_ingredientes[ingrediente]] = cantidad
+        self._usa = self.recetas > 0
+        # Divisor sin ceros; donde el menú no usa el ingrediente el cociente se ignora
+        self._divisor = np.where(self._usa, self.recetas, 1)
+
+    def vector_stock(self, stock):
+        cantidades = stock.ingredientes if isinstance(stock, Stock) else stock
+        return np.fromiter(
+            (cantidades.get(ingrediente, 0) for ingrediente in self.ingredientes),
+            dtype=np.int64, count=len(self.ingredientes),
+        )
+
+    def preparables(self, stock):
+        # Arreglo booleano, una posición por menú
+        return (self.recetas <= self.vector_stock(stock)).all(axis=1)
+
+    def porciones(self, stock):
+        # Porciones por menú; SIN_LIMITE para menús sin ingredientes
+        cocientes = np.where(self._usa, self.vector_stock(stock) // self._divisor, SIN_LIMITE)
+        return cocientes.min(axis=1, initial=SIN_LIMITE)
+
+    def porciones_por_menu(self, stock):
+        # {nombre de menú: porciones}, con None para los menús sin límite
+        return {
+            nombre: None if cantidad == SIN_LIMITE else cantidad
+            for nombre, cantidad in zip(self.menus, self.porciones(stock).tolist())
+        }
+
+    def necesidades(self, cantidades_por_menu):
+        # Ingredientes que pide un conjunto de menús {nombre: cantidad}
+        cantidades = np.zeros(len(self.menus), dtype=np.int64)
+        for nombre, cantidad in cantidades_por_menu.items():
+            cantidades[self.indice_menus[nombre]] = cantidad
+        return cantidades @ self.recetas
+
+    def alcanza_pedido(self, stock, pedido):
+        cantidades = {nombre: linea.cantidad for nombre, linea in pedido.lineas.items()}
+        return bool((self.necesidades(cantidades) <= self.vector_stock(stock)).all())
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+# Las métricas vienen apagadas salvo que se pida lo contrario. Apagadas, cada
+# punto medido solo revisa esta variable antes de seguir.
+_activo = os.environ.get("RESTAURANTE_METRICAS", "") not in ("", "0")
+
+_candado = threading.Lock()
+_histogramas = {}
+_contadores = {}
+
+# Cubetas por potencias de 2 desde ~1 µs (2**10 ns) hasta ~18 minutos
+_PRIMER_EXPONENTE = 10
+_N_CUBETAS = 40
+
+
+def activar():
+    global _activo
+    _activo = True
+
+
+def desactivar():
+    global _activo
+    _activo = False
+
+
+def esta_activo():
+    return _activo
+
+
+class Histograma:
+    def __init__(self):
+        self.cubetas = [0] * _N_CUBETAS
+        self.cantidad = 0
+        self.suma_ns = 0
+        self.minimo_ns = None
+        self.maximo_ns = 0
+
+    def registrar(self, duracion_ns):
+        indice = min(max(duracion_ns.bit_length() - _PRIMER_EXPONENTE, 0), _N_CUBETAS - 1)
+        self.cubetas[indice] += 1
+        self.cantidad += 1
+        self.suma_ns += duracion_ns
+        if self.minimo_ns is None or duracion_ns < self.minimo_ns:
+            self.minimo_ns = duracion_ns
+        if duracion_ns > self.maximo_ns:
+            self.maximo_ns = duracion_ns
+
+    def percentil(self, p):
+        # Cota superior de la cubeta donde cae el percentil p (0-100)
+        if not self.cantidad:
+            return 0
+        objetivo = self.cantidad * p / 100
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cubetas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return min(2 ** (indice + _PRIMER_EXPONENTE), self.maximo_ns)
+        return self.maximo_ns
+
+    def resumen(self):
+        return {
+            "cantidad": self.cantidad,
+            "promedio_us": self.suma_ns / self.cantidad / 1000 if self.cantidad else 0,
+            "min_us": (self.minimo_ns or 0) / 1000,
+            "max_us": self.maximo_ns / 1000,
+            "p50_us": self.percentil(50) / 1000,
+            "p95_us": self.percentil(95) / 1000,
+            "p99_us": self.percentil(99) / 1000,
+        }
+
+
+def registrar_duracion(nombre, duracion_ns):
+    with _candado:
+        histograma = _histogramas.get(nombre)
+        if histograma is None:
+            histograma = _histogramas[nombre] = Histograma()
+        histograma.registrar(duracion_ns)
+
+
+def contar(nombre, cantidad=1):
+    if not _activo:
+        return
+    with _candado:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+class Tramo:
+    # Mide lo que pasa dentro de un bloque with
+    __slots__ = ("nombre", "_inicio")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self._inicio = None
+
+    def __enter__(self):
+        if _activo:
+            self._inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        if self._inicio is not None:
+            registrar_duracion(self.nombre, time.perf_counter_ns() - self._inicio)
+            self._inicio = None
+        return False
+
+
+def medido(nombre):
+    # Decorador que mide cada llamada a la función con el nombre dado
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar_duracion(nombre, time.perf_counter_ns() - inicio)
+        return envoltura
+    return decorador
+
+
+def exportar():
+    with _candado:
+        return {
+            "tramos": {nombre: h.resumen() for nombre, h in sorted(_histogramas.items())},
+            "contadores": dict(sorted(_contadores.items())),
+        }
+
+
+def volcar(ruta="metricas.json"):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(exportar(), archivo, ensure_ascii=False, indent=2)
+
+
+def reiniciar():
+    with _candado:
+        _histogramas.clear()
+        _contadores.clear()
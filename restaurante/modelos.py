@@ -0,0 +1,357 @@
+import sys
+import threading
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+
+from restaurante.boleta import DatosBoleta, LineaBoleta, guardar_boleta
+from restaurante.dinero import IVA_PORCENTAJE, calcular_iva, pesos
+from restaurante.metricas import contar, medido
+
+# Solo informativa: los cálculos usan pesos enteros (ver restaurante.dinero)
+TASA_IVA = IVA_PORCENTAJE / 100
+
+Totales = namedtuple("Totales", ["subtotal", "iva", "total"])
+
+# Los nombres de ingredientes y menús se internan: cada nombre existe una sola
+# vez en memoria aunque aparezca en miles de recetas, pedidos y en el stock.
+intern = sys.intern
+
+# Mayor cantidad que cabe en el arreglo de una Receta
+MAX_CANTIDAD_RECETA = 2 ** (8 * array("I").itemsize) - 1
+
+class Ingrediente:
+    __slots__ = ("nombre", "cantidad")
+
+    def __init__(self, nombre, cantidad):
+        self.nombre = intern(nombre.strip().lower())
+        self.cantidad = cantidad
+
+class Receta(Mapping):
+    # Ingredientes de un menú guardados como una tupla de nombres internados y
+    # un arreglo compacto de cantidades, en vez de un dict por menú. Se usa
+    # como un dict de solo lectura {ingrediente: cantidad}. Las cantidades son
+    # unidades enteras no negativas del stock.
+    __slots__ = ("nombres", "cantidades")
+
+    def __init__(self, ingredientes=()):
+        pares = ingredientes.items() if isinstance(ingredientes, Mapping) else ingredientes
+        nombres = []
+        cantidades = array("I")
+        for nombre, cantidad in pares:
+            nombres.append(intern(nombre))
+            cantidades.append(cantidad)
+        self.nombres = tuple(nombres)
+        self.cantidades = cantidades
+
+    def __getitem__(self, nombre):
+        for indice, actual in enumerate(self.nombres):
+            if actual == nombre:
+                return self.cantidades[indice]
+        raise KeyError(nombre)
+
+    def __iter__(self):
+        return iter(self.nombres)
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def items(self):
+        return zip(self.nombres, self.cantidades)
+
+    def __repr__(self):
+        return f"Receta({dict(self.items())!r})"
+
+class Menu:
+    __slots__ = ("nombre", "precio", "ingredientes", "icono")
+
+    def __init__(self, nombre, precio, ingredientes, icono=None):
+        self.nombre = intern(nombre)
+        self.precio = pesos(precio)
+        self.ingredientes = ingredientes if isinstance(ingredientes, Receta) else Receta(ingredientes)
+        self.icono = icono
+
+    def es_preparable(self, stock):
+        # Con un Stock se consulta directo su dict de cantidades
+        cantidades = stock.ingredientes if isinstance(stock, Stock) else stock
+        receta = self.ingredientes
+        for ingrediente, cantidad_necesaria in zip(receta.nombres, receta.cantidades):
+            if cantidades.get(ingrediente, 0) < cantidad_necesaria:
+                return False
+        return True
+
+    @medido("Menu.preparar")
+    def preparar(self, stock):
+        # Con un Stock el descuento pasa por él, para que avise del cambio
+        if isinstance(stock, Stock):
+            return stock.consumir(self.ingredientes)
+        if self.es_preparable(stock):
+            for ingrediente, cantidad_necesaria in self.ingredientes.items():
+                stock[ingrediente] -= cantidad_necesaria
+            return True
+        return False
+
+class Stock:
+    # Se puede compartir entre varios hilos (cajas). Cada ingrediente queda
+    # protegido por uno de N_CANDADOS candados según su nombre, así dos cajas
+    # que usan ingredientes distintos no se esperan entre sí. Las operaciones
+    # con varios ingredientes toman sus candados siempre en el mismo orden.
+    # Los suscriptores se llaman en el hilo que hizo el cambio, fuera de los
+    # candados. Los de suscribir_cantidades, en cambio, dentro de ellos.
+    N_CANDADOS = 64
+
+    def __init__(self):
+        self.ingredientes = {}
+        # Funciones que reciben los nombres de ingredientes cuya cantidad cambió
+        self._suscriptores = []
+        # Funciones que reciben {nombre: cantidad} consumida (negativa si se devolvió)
+        self._consumidores = []
+        # Funciones que reciben {nombre: cantidad final} (None si se eliminó)
+        self._observadores_cantidades = []
+        self._candados = [threading.Lock() for _ in range(self.N_CANDADOS)]
+
+    def _bloquear(self, nombres):
+        indices = sorted({hash(nombre) % self.N_CANDADOS for nombre in nombres})
+        return _Candados([self._candados[indice] for indice in indices])
+
+    def suscribir(self, funcion):
+        self._suscriptores.append(funcion)
+
+    def _notificar(self, nombres):
+        for funcion in self._suscriptores:
+            funcion(nombres)
+
+    def suscribir_consumo(self, funcion):
+        self._consumidores.append(funcion)
+
+    def suscribir_cantidades(self, funcion):
+        # funcion se llama con los candados tomados, así las cantidades llegan en
+        # el mismo orden en que cambiaron. Debe ser rápida y no tocar el stock.
+        self._observadores_cantidades.append(funcion)
+
+    def _avisar_cantidades(self, nombres):
+        if self._observadores_cantidades:
+            cantidades = {nombre: self.ingredientes.get(nombre) for nombre in nombres}
+            for funcion in self._observadores_cantidades:
+                funcion(cantidades)
+
+    def get(self, nombre, defecto=0):
+        return self.ingredientes.get(nombre, defecto)
+
+    @medido("Stock.agregar_ingrediente")
+    def agregar_ingrediente(self, ingrediente):
+        nombre = ingrediente.nombre
+        with self._bloquear((nombre,)):
+            if nombre in self.ingredientes:
+                self.ingredientes[nombre] += ingrediente.cantidad
+            else:
+                self.ingredientes[nombre] = ingrediente.cantidad
+            self._avisar_cantidades((nombre,))
+        self._notificar((nombre,))
+
+    @medido("Stock.agregar_lote")
+    def agregar_lote(self, ingredientes):
+        # Suma muchos ingredientes de una vez (por ejemplo una guía de despacho)
+        # con una sola notificación. Devuelve lo agregado por ingrediente.
+        agregados = {}
+        for ingrediente in ingredientes:
+            agregados[ingrediente.nombre] = agregados.get(ingrediente.nombre, 0) + ingrediente.cantidad
+        if not agregados:
+            return agregados
+        with self._bloquear(agregados):
+            for nombre, cantidad in agregados.items():
+                self.ingredientes[nombre] = self.ingredientes.get(nombre, 0) + cantidad
+            self._avisar_cantidades(agregados)
+        self._notificar(tuple(agregados))
+        return agregados
+
+    def eliminar_ingrediente(self, nombre):
+        nombre = nombre.strip().lower()
+        with self._bloquear((nombre,)):
+            eliminado = self.ingredientes.pop(nombre, None) is not None
+            if eliminado:
+                self._avisar_cantidades((nombre,))
+        if eliminado:
+            self._notificar((nombre,))
+
+    def faltantes(self, necesidades):
+        # Cuánto falta de cada ingrediente para cubrir las necesidades
+        faltan = {}
+        for ingrediente, cantidad_necesaria in necesidades.items():
+            disponible = self.ingredientes.get(ingrediente, 0)
+            if disponible < cantidad_necesaria:
+                faltan[ingrediente] = cantidad_necesaria - disponible
+        return faltan
+
+    @medido("Stock.consumir")
+    def consumir(self, receta, veces=1):
+        # Revisa todo antes de descontar, así nunca queda un descuento a medias
+        _revisar_cantidad(veces)
+        necesidades = _multiplicar(receta, veces)
+        with self._bloquear(necesidades):
+            if self.faltantes(necesidades):
+                contar("stock.rechazos")
+                return False
+            for ingrediente, cantidad_necesaria in necesidades.items():
+                self.ingredientes[ingrediente] -= cantidad_necesaria
+            self._avisar_cantidades(necesidades)
+        self._notificar(tuple(necesidades))
+        for funcion in self._consumidores:
+            funcion(necesidades)
+        return True
+
+    def devolver(self, receta, veces=1):
+        necesidades = _multiplicar(receta, veces)
+        with self._bloquear(necesidades):
+            for ingrediente, cantidad in necesidades.items():
+                self.ingredientes[ingrediente] = self.ingredientes.get(ingrediente, 0) + cantidad
+            self._avisar_cantidades(necesidades)
+        self._notificar(tuple(necesidades))
+        if self._consumidores:
+            devueltos = {ingrediente: -cantidad for ingrediente, cantidad in necesidades.items()}
+            for funcion in self._consumidores:
+                funcion(devueltos)
+
+    @medido("Stock.reservar")
+    def reservar(self, pedido):
+        # Reserva de una vez los ingredientes de todo el pedido. Si falta algo
+        # no se descuenta nada y se devuelve None.
+        necesidades = pedido.ingredientes_necesarios()
+        if not self.consumir(necesidades):
+            return None
+        return Reserva(self, necesidades)
+
+class _Candados:
+    # Toma varios candados en orden y los suelta al revés
+    __slots__ = ("candados",)
+
+    def __init__(self, candados):
+        self.candados = candados
+
+    def __enter__(self):
+        for candado in self.candados:
+            candado.acquire()
+        return self
+
+    def __exit__(self, *excepcion):
+        for candado in reversed(self.candados):
+            candado.release()
+        return False
+
+class Reserva:
+    # Ingredientes apartados para un pedido. Se pueden devolver por menú, al
+    # quitar una línea, o todos juntos si el pedido se cancela.
+    __slots__ = ("stock", "cantidades")
+
+    def __init__(self, stock, cantidades):
+        self.stock = stock
+        self.cantidades = dict(cantidades)
+
+    def agregar(self, receta, veces=1):
+        # Suma a la reserva ingredientes que ya se descontaron del stock
+        for ingrediente, cantidad in _multiplicar(receta, veces).items():
+            self.cantidades[ingrediente] = self.cantidades.get(ingrediente, 0) + cantidad
+
+    def devolver_menu(self, menu, cantidad=1):
+        _revisar_cantidad(cantidad)
+        necesidades = _multiplicar(menu.ingredientes, cantidad)
+        for ingrediente, necesaria in necesidades.items():
+            if self.cantidades.get(ingrediente, 0) < necesaria:
+                raise ValueError(f"La reserva no incluye {cantidad} de {menu.nombre}")
+        for ingrediente, necesaria in necesidades.items():
+            self.cantidades[ingrediente] -= necesaria
+            if self.cantidades[ingrediente] == 0:
+                del self.cantidades[ingrediente]
+        self.stock.devolver(necesidades)
+
+    def cancelar(self):
+        cantidades, self.cantidades = self.cantidades, {}
+        if cantidades:
+            self.stock.devolver(cantidades)
+
+def _multiplicar(receta, veces):
+    # Sin los ingredientes con cantidad 0, que no mueven nada del stock
+    cantidades = receta.cantidades if isinstance(receta, Receta) else receta.values()
+    if veces == 1 and 0 not in cantidades:
+        return receta
+    return {ingrediente: cantidad * veces for ingrediente, cantidad in receta.items() if cantidad}
+
+def _revisar_cantidad(cantidad):
+    if cantidad <= 0:
+        raise ValueError(f"La cantidad debe ser positiva: {cantidad!r}")
+
+class LineaPedido:
+    __slots__ = ("menu", "cantidad")
+
+    def __init__(self, menu, cantidad=0):
+        self.menu = menu
+        self.cantidad = cantidad
+
+    def subtotal(self):
+        return self.menu.precio * self.cantidad
+
+class Pedido:
+    __slots__ = ("lineas", "_subtotal", "_iva", "_total")
+
+    def __init__(self):
+        # Líneas del pedido indexadas por nombre de menú, en orden de llegada
+        self.lineas = {}
+        # Totales acumulados: se actualizan al agregar o eliminar menús
+        # para que leerlos no tenga que recorrer todo el pedido.
+        self._subtotal = 0
+        self._iva = 0
+        self._total = 0
+
+    @medido("Pedido.agregar_menu")
+    def agregar_menu(self, menu, cantidad=1):
+        _revisar_cantidad(cantidad)
+        linea = self.lineas.get(menu.nombre)
+        if linea is None:
+            linea = self.lineas[menu.nombre] = LineaPedido(menu)
+        linea.cantidad += cantidad
+        self._actualizar_totales(menu.precio * cantidad)
+
+    @medido("Pedido.eliminar_menu")
+    def eliminar_menu(self, menu, cantidad=1):
+        _revisar_cantidad(cantidad)
+        linea = self.lineas.get(menu.nombre)
+        if linea is None or linea.cantidad < cantidad:
+            raise ValueError(f"El pedido no tiene {cantidad} de {menu.nombre}")
+        linea.cantidad -= cantidad
+        if linea.cantidad == 0:
+            del self.lineas[menu.nombre]
+        self._actualizar_totales(-menu.precio * cantidad)
+
+    def buscar_linea(self, nombre):
+        return self.lineas.get(nombre)
+
+    def ingredientes_necesarios(self):
+        # Ingredientes de todas las líneas sumados, para revisarlos de una vez
+        necesidades = {}
+        for linea in self.lineas.values():
+            for ingrediente, cantidad in linea.menu.ingredientes.items():
+                necesidades[ingrediente] = necesidades.get(ingrediente, 0) + cantidad * linea.cantidad
+        return necesidades
+
+    def _actualizar_totales(self, diferencia):
+        self._subtotal += diferencia
+        # El IVA se recalcula desde el subtotal: se redondea una vez por pedido, no por línea
+        self._iva = calcular_iva(self._subtotal)
+        self._total = self._subtotal + self._iva
+
+    def total(self):
+        return self._subtotal
+
+    def totales(self):
+        return Totales(self._subtotal, self._iva, self._total)
+
+    def datos_boleta(self):
+        # Copia inmutable del pedido, segura para generar la boleta en otro hilo
+        lineas = tuple(
+            LineaBoleta(linea.menu.nombre, linea.cantidad, linea.menu.precio, linea.subtotal())
+            for linea in self.lineas.values()
+        )
+        return DatosBoleta(lineas, self.totales())
+
+    def generar_boleta(self, archivo="boleta.pdf", formato="pdf"):
+        guardar_boleta(self.datos_boleta(), archivo, formato)
@@ -0,0 +1,59 @@
+from collections import deque
+
+from customtkinter import CTkLabel
+
+from restaurante.metricas import contar
+
+DURACION_MS = 2500
+# Con avisos en espera cada uno se muestra menos tiempo, pero al menos esto
+DURACION_MINIMA_MS = 400
+COLORES = {"advertencia": "orange"}
+
+
+class BarraNotificaciones(CTkLabel):
+    # Barra de avisos al pie de la ventana, para no frenar la caja con ventanas
+    # modales. Los avisos se muestran de a uno. Si llega uno igual al que se
+    # está mostrando, o al último en espera, se juntan: "Menú Pepsi agregado (x3)".
+    # Se usa solo desde el hilo de Tk.
+    def __init__(self, ventana, duracion_ms=DURACION_MS, max_espera=20, **opciones):
+        super().__init__(ventana, text="", anchor="w", **opciones)
+        self.duracion_ms = duracion_ms
+        self._color_normal = self.cget("text_color")
+        # Avisos como [texto, veces, nivel]; si se llena se pierden los más viejos
+        self._espera = deque(maxlen=max_espera)
+        self._actual = None
+        self._programado = None
+
+    def mostrar(self, texto, nivel="info"):
+        contar("gui.notificaciones")
+        ultimo = self._espera[-1] if self._espera else self._actual
+        if ultimo is not None and ultimo[0] == texto and ultimo[2] == nivel:
+            ultimo[1] += 1
+            if ultimo is self._actual:
+                self._dibujar()
+                self._programar()
+            return
+        self._espera.append([texto, 1, nivel])
+        if self._actual is None:
+            self._siguiente()
+
+    def _siguiente(self):
+        self._programado = None
+        if not self._espera:
+            self._actual = None
+            self.configure(text="")
+            return
+        self._actual = self._espera.popleft()
+        self._dibujar()
+        self._programar()
+
+    def _programar(self):
+        if self._programado is not None:
+            self.after_cancel(self._programado)
+        duracion = max(self.duracion_ms // (1 + len(self._espera)), DURACION_MINIMA_MS)
+        self._programado = self.after(duracion, self._siguiente)
+
+    def _dibujar(self):
+        texto, veces, nivel = self._actual
+        self.configure(text=texto if veces == 1 else f"{texto} (x{veces})",
+                       text_color=COLORES.get(nivel, self._color_normal))
@@ -0,0 +1,255 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from restaurante.modelos import Stock
+
+RUTA_BASE_DATOS = "restaurante.db"
+# Fallos seguidos del hilo escritor antes de que registrar empiece a fallar
+MAX_REINTENTOS = 5
+
+log = logging.getLogger(__name__)
+
+# Una fila por pedido y una por línea, con índices que cubren las consultas de
+# reportes: se responden leyendo solo el índice del rango de fechas pedido.
+ESQUEMA_VENTAS = """
+    CREATE TABLE IF NOT EXISTS ventas (
+        id INTEGER PRIMARY KEY,
+        fecha REAL NOT NULL,
+        subtotal INTEGER NOT NULL,
+        iva INTEGER NOT NULL,
+        total INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ventas_por_fecha ON ventas (fecha, subtotal, iva, total);
+    CREATE TABLE IF NOT EXISTS lineas_venta (
+        venta INTEGER NOT NULL REFERENCES ventas (id),
+        fecha REAL NOT NULL,
+        menu TEXT NOT NULL,
+        cantidad INTEGER NOT NULL,
+        subtotal INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS lineas_venta_por_fecha ON lineas_venta (fecha, menu, cantidad, subtotal);
+"""
+
+
+class Diario:
+    # Guarda en SQLite (modo WAL) un diario de eventos de stock y pedidos que
+    # solo crece, más instantáneas compactadas del stock. Al partir se carga la
+    # última instantánea y se aplican solo los eventos posteriores.
+    #
+    # Los eventos se encolan y un hilo los escribe en grupo cada intervalo_commit
+    # segundos (o al juntar max_pendientes), así cada clic no paga su propio fsync.
+    # Si SQLite falla (por ejemplo "database is locked") el grupo vuelve a la
+    # cola y se reintenta; tras MAX_REINTENTOS fallos seguidos, registrar lanza
+    # RuntimeError hasta que una escritura resulte.
+    # Los eventos de stock guardan la cantidad final del ingrediente, no la
+    # diferencia, por lo que aplicarlos de nuevo sobre una instantánea es seguro.
+    # Los pedidos cerrados van a las tablas de ventas, que consulta LibroVentas.
+    def __init__(self, ruta=RUTA_BASE_DATOS, intervalo_commit=0.05, max_pendientes=256, eventos_por_instantanea=5000):
+        self.ruta = ruta
+        self.intervalo_commit = intervalo_commit
+        self.max_pendientes = max_pendientes
+        self.eventos_por_instantanea = eventos_por_instantanea
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._candado_conexion = threading.Lock()
+        self._crear_tablas()
+
+        self._pendientes = []
+        self._ventas_pendientes = []
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self._error = None
+        self._stock = None
+        self._eventos_desde_instantanea = 0
+        self._hilo = threading.Thread(target=self._escribir_en_grupo, name="diario", daemon=True)
+        self._hilo.start()
+
+    def _crear_tablas(self):
+        with self._candado_conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            # En WAL, NORMAL solo hace fsync en los checkpoints
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS eventos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    datos TEXT NOT NULL,
+                    fecha REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS instantaneas (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ultimo_evento INTEGER NOT NULL,
+                    stock TEXT NOT NULL,
+                    fecha REAL NOT NULL
+                );
+            """)
+            self._conexion.executescript(ESQUEMA_VENTAS)
+            self._conexion.commit()
+
+    def cargar(self, stock=None):
+        # Reconstruye el stock desde la última instantánea y el resto del diario,
+        # y lo deja conectado para registrar sus cambios de ahora en adelante.
+        stock = stock if stock is not None else Stock()
+        with self._candado_conexion:
+            fila = self._conexion.execute(
+                "SELECT ultimo_evento, stock FROM instantaneas ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            ultimo_evento = 0
+            if fila is not None:
+                ultimo_evento = fila[0]
+                stock.ingredientes.update(json.loads(fila[1]))
+            eventos = self._conexion.execute(
+                "SELECT datos FROM eventos WHERE tipo = 'stock' AND id > ? ORDER BY id", (ultimo_evento,)
+            )
+            for (datos,) in eventos:
+                _aplicar_evento_stock(stock, json.loads(datos))
+        self.conectar(stock)
+        return stock
+
+    def conectar(self, stock):
+        self._stock = stock
+        # Las cantidades se toman dentro de los candados del stock: un evento
+        # nunca queda en cola detrás de otro más nuevo del mismo ingrediente
+        stock.suscribir_cantidades(self._stock_cambiado)
+
+    def _stock_cambiado(self, cantidades):
+        self.registrar("stock", cantidades)
+
+    def registrar_pedido(self, pedido):
+        self._encolar(self._ventas_pendientes, (time.time(), pedido.datos_boleta()))
+
+    def registrar(self, tipo, datos):
+        self._encolar(self._pendientes, (tipo, json.dumps(datos, ensure_ascii=False), time.time()))
+
+    def _encolar(self, cola, elemento):
+        with self._condicion:
+            if self._cerrado:
+                raise RuntimeError("El diario ya está cerrado")
+            cola.append(elemento)
+            if self._error is not None:
+                # El elemento queda en cola por si la base se recupera
+                raise RuntimeError(f"El diario no puede escribir en {self.ruta}: {self._error}") from self._error
+            if len(self._pendientes) + len(self._ventas_pendientes) >= self.max_pendientes:
+                self._condicion.notify()
+
+    def _tomar_pendientes(self):
+        pendientes, self._pendientes = self._pendientes, []
+        ventas, self._ventas_pendientes = self._ventas_pendientes, []
+        return pendientes, ventas
+
+    def _devolver_pendientes(self, pendientes, ventas):
+        # Un grupo que no se pudo escribir vuelve delante de lo que llegó después
+        with self._condicion:
+            self._pendientes[:0] = pendientes
+            self._ventas_pendientes[:0] = ventas
+
+    def sincronizar(self):
+        # Escribe de inmediato lo que esté pendiente
+        with self._condicion:
+            pendientes, ventas = self._tomar_pendientes()
+        try:
+            self._escribir(pendientes, ventas)
+        except sqlite3.Error:
+            self._devolver_pendientes(pendientes, ventas)
+            raise
+
+    def _escribir_en_grupo(self):
+        fallos = 0
+        while True:
+            with self._condicion:
+                if not self._cerrado and (
+                    fallos or len(self._pendientes) + len(self._ventas_pendientes) < self.max_pendientes
+                ):
+                    # Después de un fallo se espera más antes de reintentar
+                    self._condicion.wait(self.intervalo_commit * 2 ** min(fallos, 6))
+                pendientes, ventas = self._tomar_pendientes()
+                cerrado = self._cerrado
+            try:
+                self._escribir(pendientes, ventas)
+            except sqlite3.Error as error:
+                fallos += 1
+                log.exception("No se pudo escribir el diario en %s (intento %d)", self.ruta, fallos)
+                self._devolver_pendientes(pendientes, ventas)
+                if fallos >= MAX_REINTENTOS:
+                    with self._condicion:
+                        self._error = error
+                if cerrado:
+                    # cerrar() vuelve a intentarlo y avisa si tampoco puede
+                    return
+                continue
+            if fallos:
+                fallos = 0
+                with self._condicion:
+                    self._error = None
+            if self._eventos_desde_instantanea >= self.eventos_por_instantanea and self._stock is not None:
+                try:
+                    self.instantanea()
+                except sqlite3.Error:
+                    # Los eventos siguen en la base; se intenta de nuevo en el próximo grupo
+                    log.exception("No se pudo guardar la instantánea del diario en %s", self.ruta)
+            if cerrado:
+                return
+
+    def _escribir(self, pendientes, ventas=()):
+        if not pendientes and not ventas:
+            return
+        with self._candado_conexion:
+            with self._conexion:
+                self._conexion.executemany("INSERT INTO eventos (tipo, datos, fecha) VALUES (?, ?, ?)", pendientes)
+                _insertar_ventas(self._conexion, ventas)
+            self._eventos_desde_instantanea += len(pendientes)
+
+    def instantanea(self):
+        # Guarda el stock completo y borra los eventos de stock que ya cubre
+        if self._stock is None:
+            return
+        self.sincronizar()
+        with self._candado_conexion:
+            ultimo_evento = self._conexion.execute("SELECT COALESCE(MAX(id), 0) FROM eventos").fetchone()[0]
+            stock = json.dumps(dict(self._stock.ingredientes), ensure_ascii=False)
+            with self._conexion:
+                self._conexion.execute(
+                    "INSERT INTO instantaneas (ultimo_evento, stock, fecha) VALUES (?, ?, ?)",
+                    (ultimo_evento, stock, time.time()),
+                )
+                self._conexion.execute("DELETE FROM eventos WHERE tipo = 'stock' AND id <= ?", (ultimo_evento,))
+                self._conexion.execute(
+                    "DELETE FROM instantaneas WHERE id < (SELECT MAX(id) FROM instantaneas)"
+                )
+            self._eventos_desde_instantanea = 0
+
+    def cerrar(self, instantanea=True):
+        with self._condicion:
+            self._cerrado = True
+            self._condicion.notify()
+        self._hilo.join()
+        try:
+            # Lo que el hilo no alcanzó a escribir; si falla, el error llega a quien cierra
+            self.sincronizar()
+            if instantanea:
+                self.instantanea()
+        finally:
+            with self._candado_conexion:
+                self._conexion.close()
+
+
+def _aplicar_evento_stock(stock, cantidades):
+    for nombre, cantidad in cantidades.items():
+        if cantidad is None:
+            stock.ingredientes.pop(nombre, None)
+        else:
+            stock.ingredientes[nombre] = cantidad
+
+
+def _insertar_ventas(conexion, ventas):
+    # ventas: secuencia de (fecha, DatosBoleta). Se llama dentro de una transacción.
+    for fecha, (lineas, totales) in ventas:
+        cursor = conexion.execute(
+            "INSERT INTO ventas (fecha, subtotal, iva, total) VALUES (?, ?, ?, ?)", (fecha, *totales)
+        )
+        conexion.executemany(
+            "INSERT INTO lineas_venta (venta, fecha, menu, cantidad, subtotal) VALUES (?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, fecha, linea.nombre, linea.cantidad, linea.subtotal) for linea in lineas],
+        )
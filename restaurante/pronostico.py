@@ -0,0 +1,94 @@
+import math
+import threading
+import time
+from collections import namedtuple
+
+# Horas de consumo que debería cubrir una reposición (un turno)
+HORAS_COBERTURA = 8
+# Tiempo mínimo observado antes de creer en la tasa, para no exagerarla al partir
+MINIMO_OBSERVADO = 60
+
+Proyeccion = namedtuple("Proyeccion", ["nombre", "cantidad", "consumo_por_hora", "horas_restantes", "reponer"])
+
+
+class _Consumo:
+    # Consumo de un ingrediente con decaimiento exponencial: pesa más lo
+    # reciente y lo de hace varias ventanas casi no cuenta.
+    __slots__ = ("acumulado", "instante", "total")
+
+    def __init__(self, ahora):
+        self.acumulado = 0.0
+        self.instante = ahora
+        self.total = 0
+
+    def decaido(self, ahora, ventana):
+        return self.acumulado * math.exp((self.instante - ahora) / ventana)
+
+    def registrar(self, cantidad, ahora, ventana):
+        # Una devolución descuenta lo que se había contado como consumido
+        self.acumulado = max(self.decaido(ahora, ventana) + cantidad, 0.0)
+        self.instante = ahora
+        self.total += cantidad
+
+
+class Pronostico:
+    # Ritmo de consumo de cada ingrediente, a partir de lo que el stock va
+    # descontando por los pedidos. Guarda unos pocos números por ingrediente,
+    # sin historial, así la memoria no crece con las ventas. Con ese ritmo
+    # proyecta en cuántas horas se acaba cada ingrediente y cuánto reponer para
+    # cubrir horas_cobertura horas.
+    #
+    # ventana (segundos) es la constante de tiempo del promedio: el consumo de
+    # hace una ventana pesa ~37% y el de hace tres, ~5%.
+    def __init__(self, stock, ventana=3600, horas_cobertura=HORAS_COBERTURA, reloj=time.monotonic):
+        self.stock = stock
+        self.ventana = ventana
+        self.horas_cobertura = horas_cobertura
+        self._reloj = reloj
+        self._inicio = reloj()
+        self._consumos = {}
+        # Los consumos llegan desde el hilo que tocó el stock (caja o API)
+        self._candado = threading.Lock()
+        stock.suscribir_consumo(self.registrar)
+
+    def registrar(self, cantidades):
+        ahora = self._reloj()
+        with self._candado:
+            for nombre, cantidad in cantidades.items():
+                consumo = self._consumos.get(nombre)
+                if consumo is None:
+                    consumo = self._consumos[nombre] = _Consumo(ahora)
+                consumo.registrar(cantidad, ahora, self.ventana)
+
+    def consumo_por_hora(self, nombre):
+        consumo = self._consumos.get(nombre)
+        if consumo is None:
+            return 0.0
+        ahora = self._reloj()
+        with self._candado:
+            acumulado = consumo.decaido(ahora, self.ventana)
+        # Mientras no pase una ventana completa se divide solo por lo observado
+        observado = max(-self.ventana * math.expm1((self._inicio - ahora) / self.ventana), MINIMO_OBSERVADO)
+        return acumulado / observado * 3600
+
+    def total_consumido(self, nombre):
+        consumo = self._consumos.get(nombre)
+        return consumo.total if consumo is not None else 0
+
+    def proyeccion(self, nombre):
+        cantidad = self.stock.get(nombre)
+        por_hora = self.consumo_por_hora(nombre)
+        horas_restantes = cantidad / por_hora if por_hora > 0 else None
+        reponer = max(math.ceil(por_hora * self.horas_cobertura) - cantidad, 0)
+        return Proyeccion(nombre, cantidad, por_hora, horas_restantes, reponer)
+
+    def proyecciones(self):
+        return [self.proyeccion(nombre) for nombre in self.stock.ingredientes.keys() | self._consumos.keys()]
+
+    def por_agotarse(self, horas=HORAS_COBERTURA):
+        # Ingredientes que se acaban antes de horas, los más urgentes primero
+        urgentes = [
+            proyeccion for proyeccion in self.proyecciones()
+            if proyeccion.horas_restantes is not None and proyeccion.horas_restantes <= horas
+        ]
+        return sorted(urgentes, key=lambda proyeccion: proyeccion.horas_restantes)
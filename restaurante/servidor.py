@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from restaurante import metricas
+from restaurante.boleta import FORMATOS, GeneradorBoletas
+from restaurante.catalogo import Catalogo
+from restaurante.disponibilidad import Disponibilidad
+from restaurante.modelos import Pedido
+from restaurante.persistencia import Diario
+from restaurante.sesiones import GestorSesiones
+
+MAX_CUERPO = 1024 * 1024
+ESTADOS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class ErrorHttp(Exception):
+    def __init__(self, estado, mensaje, **detalles):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.detalles = detalles
+
+
+class Servidor:
+    # API HTTP local (solo biblioteca estándar) para que kioscos y tablets tomen
+    # pedidos sobre el mismo stock que la caja:
+    #
+    #   GET    /menus                   menús con precio y porciones disponibles
+    #   GET    /stock                   cantidades de todos los ingredientes
+    #   GET    /stock/<nombre>          cantidad de un ingrediente
+    #   POST   /pedidos                 {"lineas": [{"menu": "Pepsi", "cantidad": 2}]}
+    #   GET    /pedidos/<id>            detalle y totales de un pedido abierto (cualquier mesa o ticket)
+    #   DELETE /pedidos/<id>            anula el pedido y devuelve sus ingredientes
+    #   POST   /pedidos/<id>/boleta     genera la boleta (?formato=pdf|texto|escpos|html) y cierra el pedido
+    #
+    # Cada pedido reserva sus ingredientes al crearse, de una sola vez. Las
+    # boletas se generan en hilos para no frenar a los demás clientes.
+    def __init__(self, stock, catalogo, disponibilidad=None, diario=None, generador_boletas=None, sesiones=None,
+                 host="127.0.0.1", puerto=8765, max_clientes=256, tiempo_espera=10):
+        self.stock = stock
+        self.catalogo = catalogo
+        self.disponibilidad = disponibilidad or Disponibilidad(catalogo, stock)
+        self.diario = diario
+        self.generador_boletas = generador_boletas or GeneradorBoletas()
+        self.host = host
+        self.puerto = puerto
+        self.tiempo_espera = tiempo_espera
+        self._max_clientes = max_clientes
+        # Los pedidos de la API son tickets dentro de las mismas sesiones que usa la caja
+        self.sesiones = sesiones if sesiones is not None else GestorSesiones(stock)
+        self._ids = itertools.count(1)
+        self._loop = None
+        self._detenido = None
+        self._parar = False
+        self._hilo = None
+        # Ordena el arranque del loop con un detener() pedido desde otro hilo
+        self._candado = threading.Lock()
+        self._conexiones = {}
+
+    async def servir(self):
+        with self._candado:
+            self._loop = asyncio.get_running_loop()
+            self._detenido = asyncio.Event()
+            if self._parar:
+                self._detenido.set()
+        limite = asyncio.Semaphore(self._max_clientes)
+
+        async def atender(lector, escritor):
+            # Sobre max_clientes las conexiones nuevas esperan su turno
+            self._conexiones[escritor] = asyncio.current_task()
+            try:
+                async with limite:
+                    await self._atender(lector, escritor)
+            finally:
+                del self._conexiones[escritor]
+
+        servidor = await asyncio.start_server(atender, self.host, self.puerto)
+        async with servidor:
+            await self._detenido.wait()
+            # Se cierran las conexiones que quedaron abiertas (keep-alive) y se
+            # espera a que sus tareas terminen antes de salir del loop
+            tareas = list(self._conexiones.values())
+            for escritor in list(self._conexiones):
+                escritor.close()
+            await asyncio.gather(*tareas, return_exceptions=True)
+
+    def iniciar_en_hilo(self):
+        # Para correr junto a la interfaz gráfica, en su propio hilo y loop
+        self._hilo = threading.Thread(target=self._correr, name="servidor", daemon=True)
+        self._hilo.start()
+        return self._hilo
+
+    def _correr(self):
+        asyncio.run(self.servir())
+
+    def detener(self):
+        # Si corre en su propio hilo se espera a que termine: así ningún pedido
+        # de la API toca el stock después de que se cierren el diario y las boletas
+        with self._candado:
+            self._parar = True
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._detenido.set)
+        if self._hilo is not None and self._hilo is not threading.current_thread():
+            self._hilo.join()
+
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await asyncio.wait_for(lector.readline(), self.tiempo_espera)
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Línea de solicitud mal formada"}, False)
+                    break
+                encabezados = {}
+                while True:
+                    encabezado = await asyncio.wait_for(lector.readline(), self.tiempo_espera)
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    clave, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[clave.strip().lower()] = valor.strip()
+
+                try:
+                    largo = int(encabezados.get("content-length", 0))
+                    if largo < 0:
+                        raise ValueError
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Content-Length inválido"}, False)
+                    break
+                if largo > MAX_CUERPO:
+                    await self._responder(escritor, 413, {"error": "Cuerpo demasiado grande"}, False)
+                    break
+                cuerpo = await asyncio.wait_for(lector.readexactly(largo), self.tiempo_espera) if largo else b""
+
+                with metricas.Tramo("api." + metodo):
+                    estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                mantener = version == "HTTP/1.1" and encabezados.get("connection", "").lower() != "close"
+                await self._responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, estado, respuesta, mantener):
+        cuerpo = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+        cabecera = (
+            f"HTTP/1.1 {estado} {ESTADOS.get(estado, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        escritor.write(cabecera.encode("latin-1") + cuerpo)
+        await escritor.drain()
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        url = urlsplit(ruta)
+        partes = [unquote(parte) for parte in url.path.strip("/").split("/") if parte]
+        try:
+            if partes == ["menus"] and metodo == "GET":
+                return 200, self._listar_menus()
+            if partes[:1] == ["stock"] and metodo == "GET":
+                return 200, self._consultar_stock(partes[1:])
+            if partes == ["pedidos"] and metodo == "POST":
+                return 201, self._crear_pedido(_leer_json(cuerpo))
+            if len(partes) == 2 and partes[0] == "pedidos":
+                if metodo == "GET":
+                    return 200, _pedido_a_json(partes[1], self._buscar_sesion(partes[1]).datos_boleta())
+                if metodo == "DELETE":
+                    return 200, self._anular_pedido(partes[1])
+            if len(partes) == 3 and partes[0] == "pedidos" and partes[2] == "boleta" and metodo == "POST":
+                formato = parse_qs(url.query).get("formato", ["pdf"])[-1]
+                return 200, await self._generar_boleta(partes[1], formato)
+            raise ErrorHttp(404, "Ruta no encontrada")
+        except ErrorHttp as error:
+            return error.estado, {"error": str(error), **error.detalles}
+        except Exception as error:  # noqa: BLE001 - un cliente no debe botar el servidor
+            return 500, {"error": str(error)}
+
+    def _listar_menus(self):
+        return [
+            {
+                "nombre": menu.nombre,
+                "precio": menu.precio,
+                "ingredientes": dict(menu.ingredientes.items()),
+                "porciones": self.disponibilidad.porciones_de(menu.nombre),
+            }
+            for menu in self.catalogo
+        ]
+
+    def _consultar_stock(self, partes):
+        if not partes:
+            return dict(self.stock.ingredientes)
+        nombre = partes[0].strip().lower()
+        if nombre not in self.stock.ingredientes:
+            raise ErrorHttp(404, f"No hay {nombre} en el stock")
+        return {"nombre": nombre, "cantidad": self.stock.get(nombre)}
+
+    def _crear_pedido(self, datos):
+        lineas = datos.get("lineas") if isinstance(datos, dict) else None
+        if not lineas or not isinstance(lineas, list):
+            raise ErrorHttp(400, "El pedido debe traer una lista de lineas")
+        pedido = Pedido()
+        for linea in lineas:
+            nombre = linea.get("menu") if isinstance(linea, dict) else None
+            menu = self.catalogo.buscar(nombre) if isinstance(nombre, str) else None
+            cantidad = linea.get("cantidad", 1) if isinstance(linea, dict) else None
+            if menu is None:
+                raise ErrorHttp(400, f"Menú desconocido: {linea}")
+            if isinstance(cantidad, bool) or not isinstance(cantidad, int) or cantidad <= 0:
+                raise ErrorHttp(400, f"Cantidad inválida para {menu.nombre}")
+            pedido.agregar_menu(menu, cantidad)
+
+        identificador = f"ticket-{next(self._ids)}"
+        if self.sesiones.abrir(identificador, pedido) is None:
+            raise ErrorHttp(409, "No hay suficientes ingredientes",
+                            faltantes=self.stock.faltantes(pedido.ingredientes_necesarios()))
+        return _pedido_a_json(identificador, pedido.datos_boleta())
+
+    def _buscar_sesion(self, identificador):
+        sesion = self.sesiones.obtener(identificador)
+        if sesion is None:
+            raise ErrorHttp(404, f"No existe el pedido {identificador}")
+        return sesion
+
+    def _anular_pedido(self, identificador):
+        self._buscar_sesion(identificador)
+        try:
+            self.sesiones.cerrar(identificador, anular=True)
+        except KeyError:
+            raise ErrorHttp(404, f"No existe el pedido {identificador}") from None
+        return {"id": identificador, "anulado": True}
+
+    async def _generar_boleta(self, identificador, formato="pdf"):
+        if formato != "pdf" and formato not in FORMATOS:
+            raise ErrorHttp(400, f"Formato de boleta desconocido: {formato}")
+        pedido = self._buscar_sesion(identificador).pedido
+        # Se cierra antes de esperar la boleta, para no cerrarlo dos veces.
+        # Cerrado, nadie más lo cambia y se puede leer sin candado.
+        try:
+            self.sesiones.cerrar(identificador)
+        except KeyError:
+            raise ErrorHttp(404, f"No existe el pedido {identificador}") from None
+        if self.diario is not None:
+            self.diario.registrar_pedido(pedido)
+        metricas.contar("pedidos")
+        archivo = await asyncio.wrap_future(self.generador_boletas.encolar(pedido, formato=formato))
+        return {"id": identificador, "boleta": archivo, **_pedido_a_json(identificador, pedido.datos_boleta())}
+
+
+def _leer_json(cuerpo):
+    try:
+        return json.loads(cuerpo or b"{}")
+    except ValueError:
+        raise ErrorHttp(400, "El cuerpo no es JSON válido") from None
+
+
+def _pedido_a_json(identificador, datos):
+    lineas, totales = datos
+    return {
+        "id": identificador,
+        "lineas": [linea._asdict() for linea in lineas],
+        "totales": totales._asdict(),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="API local de pedidos del restaurante")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--base-datos", default=None, help="archivo SQLite del diario de stock y pedidos")
+    parser.add_argument("--menus", default=None, help="catálogo de menús en JSON o CSV")
+    opciones = parser.parse_args(argumentos)
+
+    diario = Diario(opciones.base_datos) if opciones.base_datos else Diario()
+    stock = diario.cargar()
+    catalogo = Catalogo.cargar(opciones.menus) if opciones.menus else Catalogo.cargar()
+    servidor = Servidor(stock, catalogo, diario=diario, host=opciones.host, puerto=opciones.puerto)
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.generador_boletas.cerrar()
+        servidor.sesiones.anular_abiertas()
+        diario.cerrar()
+
+
+if __name__ == "__main__":
+    main()
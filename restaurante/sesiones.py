@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+from restaurante.modelos import Pedido, Reserva
+
+PedidoArchivado = namedtuple("PedidoArchivado", ["clave", "datos", "abierto_en", "cerrado_en", "anulado"])
+
+
+class Sesion:
+    # Un pedido abierto (una mesa o un ticket) con los ingredientes que ya
+    # apartó del stock compartido. La caja y la API pueden tocar la misma
+    # sesión desde hilos distintos: cada cambio y el cierre toman su candado.
+    __slots__ = ("clave", "stock", "pedido", "reserva", "abierto_en", "cerrada", "_candado")
+
+    def __init__(self, clave, stock, pedido=None, reserva=None):
+        self.clave = clave
+        self.stock = stock
+        self.pedido = pedido if pedido is not None else Pedido()
+        self.reserva = reserva if reserva is not None else Reserva(stock, {})
+        self.abierto_en = time.time()
+        self.cerrada = False
+        self._candado = threading.Lock()
+
+    def agregar_menu(self, menu, cantidad=1):
+        with self._candado:
+            self._revisar_abierta()
+            if not self.stock.consumir(menu.ingredientes, cantidad):
+                return False
+            self.reserva.agregar(menu.ingredientes, cantidad)
+            self.pedido.agregar_menu(menu, cantidad)
+            return True
+
+    def eliminar_menu(self, menu, cantidad=1):
+        with self._candado:
+            self._revisar_abierta()
+            # Se revisan el pedido y la reserva antes de cambiar cualquiera de los dos
+            linea = self.pedido.buscar_linea(menu.nombre)
+            if linea is None or linea.cantidad < cantidad:
+                raise ValueError(f"El pedido no tiene {cantidad} de {menu.nombre}")
+            self.reserva.devolver_menu(menu, cantidad)
+            self.pedido.eliminar_menu(menu, cantidad)
+
+    def datos_boleta(self):
+        with self._candado:
+            return self.pedido.datos_boleta()
+
+    def _cerrar(self, anular):
+        # Después de esto ya nadie descuenta stock para esta sesión
+        with self._candado:
+            self.cerrada = True
+            if anular:
+                self.reserva.cancelar()
+            return self.pedido.datos_boleta()
+
+    def _revisar_abierta(self):
+        if self.cerrada:
+            raise ValueError(f"El pedido de {self.clave} ya está cerrado")
+
+
+class GestorSesiones:
+    # Pedidos abiertos indexados por mesa o número de ticket, todos sobre el
+    # mismo Stock. Los pedidos cerrados se guardan como DatosBoleta (tuplas
+    # inmutables) en un archivo acotado a los últimos max_archivados.
+    def __init__(self, stock, max_archivados=10_000):
+        self.stock = stock
+        self.actual = None
+        self._abiertas = {}
+        self._archivo = deque(maxlen=max_archivados)
+        self._candado = threading.Lock()
+
+    def abrir(self, clave, pedido=None):
+        # Con un pedido ya armado se reservan sus ingredientes de una vez;
+        # si no alcanzan se devuelve None y no se abre nada.
+        with self._candado:
+            if clave in self._abiertas:
+                raise ValueError(f"Ya hay un pedido abierto para {clave}")
+            reserva = None
+            if pedido is not None:
+                reserva = self.stock.reservar(pedido)
+                if reserva is None:
+                    return None
+            sesion = self._abiertas[clave] = Sesion(clave, self.stock, pedido, reserva)
+            return sesion
+
+    def obtener(self, clave):
+        return self._abiertas.get(clave)
+
+    def cambiar(self, clave):
+        # Deja como actual la sesión de la clave, abriéndola si no existe
+        with self._candado:
+            sesion = self._abiertas.get(clave)
+            if sesion is None:
+                sesion = self._abiertas[clave] = Sesion(clave, self.stock)
+            self.actual = sesion
+            return sesion
+
+    def cerrar(self, clave, anular=False):
+        # Cierra el pedido y lo archiva. Al anularlo sus ingredientes vuelven al stock.
+        with self._candado:
+            sesion = self._abiertas.pop(clave, None)
+            if sesion is None:
+                raise KeyError(clave)
+            if self.actual is sesion:
+                self.actual = None
+        archivado = PedidoArchivado(clave, sesion._cerrar(anular), sesion.abierto_en, time.time(), anular)
+        self._archivo.append(archivado)
+        return archivado
+
+    def anular_abiertas(self):
+        # Al apagar: lo que no se cobró devuelve sus ingredientes al stock
+        return [self.cerrar(clave, anular=True) for clave in self.abiertas()]
+
+    def abiertas(self):
+        with self._candado:
+            return list(self._abiertas)
+
+    def archivados(self):
+        return list(self._archivo)
+
+    def __len__(self):
+        return len(self._abiertas)
+
+    def __contains__(self, clave):
+        return clave in self._abiertas
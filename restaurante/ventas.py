@@ -0,0 +1,56 @@
+import sqlite3
+from datetime import date, datetime
+
+from restaurante.persistencia import RUTA_BASE_DATOS
+
+
+class LibroVentas:
+    # Consultas de cierre y reportes sobre las ventas que registra el Diario.
+    # Usa su propia conexión, que solo lee; con WAL no bloquea a la caja.
+    # desde y hasta aceptan datetime, date (desde la medianoche) o segundos
+    # epoch, y el rango incluye desde y excluye hasta. Los montos son pesos
+    # enteros, y las sumas también.
+    def __init__(self, ruta=RUTA_BASE_DATOS):
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+
+    def _consultar(self, sql, desde, hasta):
+        return self._conexion.execute(sql, (_marca(desde, 0), _marca(hasta, float("inf")))).fetchall()
+
+    def resumen(self, desde=None, hasta=None):
+        pedidos, subtotal, iva, total = self._consultar(
+            "SELECT COUNT(*), COALESCE(SUM(subtotal), 0), COALESCE(SUM(iva), 0), COALESCE(SUM(total), 0)"
+            " FROM ventas WHERE fecha >= ? AND fecha < ?", desde, hasta,
+        )[0]
+        return {"pedidos": pedidos, "subtotal": subtotal, "iva": iva, "total": total}
+
+    def iva(self, desde=None, hasta=None):
+        return self.resumen(desde, hasta)["iva"]
+
+    def ingresos_por_hora(self, desde=None, hasta=None):
+        # [(hora local "AAAA-MM-DD HH:00", pedidos, total)] en orden cronológico
+        filas = self._consultar(
+            "SELECT strftime('%Y-%m-%d %H:00', fecha, 'unixepoch', 'localtime') AS hora, COUNT(*), COALESCE(SUM(total), 0)"
+            " FROM ventas WHERE fecha >= ? AND fecha < ? GROUP BY hora ORDER BY hora", desde, hasta,
+        )
+        return [(hora, pedidos, total) for hora, pedidos, total in filas]
+
+    def unidades_por_menu(self, desde=None, hasta=None):
+        # [(menú, unidades, subtotal)] de los más vendidos a los menos
+        filas = self._consultar(
+            "SELECT menu, SUM(cantidad) AS unidades, COALESCE(SUM(subtotal), 0) FROM lineas_venta"
+            " WHERE fecha >= ? AND fecha < ? GROUP BY menu ORDER BY unidades DESC, menu", desde, hasta,
+        )
+        return [(menu, unidades, subtotal) for menu, unidades, subtotal in filas]
+
+    def cerrar(self):
+        self._conexion.close()
+
+
+def _marca(valor, defecto):
+    if valor is None:
+        return defecto
+    if isinstance(valor, datetime):
+        return valor.timestamp()
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day).timestamp()
+    return float(valor)
@@ -0,0 +1,70 @@
+import pytest
+
+from restaurante import boleta
+from restaurante.boleta import (
+    ANCHO_80MM, ESC_CORTAR, ESC_INICIAR, escpos_boleta, extension_formato, guardar_boleta, html_boleta,
+    registrar_formato, renderizar_boleta, texto_boleta,
+)
+from restaurante.modelos import Menu, Pedido
+
+
+def _datos():
+    pedido = Pedido()
+    pedido.agregar_menu(Menu("Pepsi", 1100, {}), 2)
+    pedido.agregar_menu(Menu("Ñoquis <caseros> & salsa", 12500, {}))
+    return pedido.datos_boleta()
+
+
+@pytest.mark.parametrize("ancho", [32, ANCHO_80MM])
+def test_texto_en_columnas_de_ancho_fijo(ancho):
+    lineas = texto_boleta(_datos(), ancho).splitlines()
+
+    assert all(len(linea) <= ancho for linea in lineas)
+    assert lineas[lineas.index("Pepsi") + 1] == "2 x $1.100" + "$2.200".rjust(ancho - 10)
+    assert lineas[-3:] == [
+        "Subtotal" + "$14.700".rjust(ancho - 8),
+        "IVA (19%)" + "$2.793".rjust(ancho - 9),
+        "Total" + "$17.493".rjust(ancho - 5),
+    ]
+
+
+def test_escpos_con_comandos_y_tildes():
+    contenido = escpos_boleta(_datos())
+
+    assert contenido.startswith(ESC_INICIAR)
+    assert contenido.endswith(ESC_CORTAR)
+    assert "Ñoquis".encode("cp858") in contenido
+    assert b"Total" in contenido
+
+
+def test_html_escapa_los_nombres():
+    contenido = html_boleta(_datos())
+
+    assert "Ñoquis &lt;caseros&gt; &amp; salsa" in contenido
+    assert "<caseros>" not in contenido
+    assert "<b>Total: $17.493</b>" in contenido
+
+
+def test_formatos_desconocidos():
+    with pytest.raises(ValueError):
+        extension_formato("bmp")
+    with pytest.raises(ValueError):
+        renderizar_boleta(_datos(), "pdf")
+    assert extension_formato("pdf") == ".pdf"
+
+
+def test_guardar_texto_y_bytes(tmp_path):
+    datos = _datos()
+    guardar_boleta(datos, tmp_path / "boleta.txt", "texto")
+    guardar_boleta(datos, tmp_path / "boleta.bin", "escpos")
+
+    assert (tmp_path / "boleta.txt").read_text(encoding="utf-8") == texto_boleta(datos)
+    assert (tmp_path / "boleta.bin").read_bytes() == escpos_boleta(datos)
+
+
+def test_registrar_formato(monkeypatch):
+    monkeypatch.setattr(boleta, "FORMATOS", dict(boleta.FORMATOS))
+    registrar_formato("total", ".total", lambda datos: str(datos.totales.total))
+
+    assert extension_formato("total") == ".total"
+    assert renderizar_boleta(_datos(), "total") == "17493"
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from restaurante.catalogo import Catalogo
+from restaurante.modelos import MAX_CANTIDAD_RECETA, Menu
+
+
+def _catalogo_json(tmp_path, menus):
+    ruta = tmp_path / "menus.json"
+    ruta.write_text(json.dumps(menus), encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.mark.parametrize("cantidad", [-1, 1.5, "2", True, None, MAX_CANTIDAD_RECETA + 1])
+def test_cantidad_invalida_en_la_receta(tmp_path, cantidad):
+    ruta = _catalogo_json(tmp_path, [{"nombre": "Completo", "precio": 1800, "ingredientes": {"pan": cantidad}}])
+
+    with pytest.raises(ValueError, match="Cantidad inválida de pan en el menú Completo"):
+        Catalogo.cargar(ruta)
+
+
+def test_cantidad_maxima_en_la_receta(tmp_path):
+    ruta = _catalogo_json(tmp_path, [
+        {"nombre": "Completo", "precio": 1800, "ingredientes": {"pan": MAX_CANTIDAD_RECETA, "agua": 0}},
+    ])
+
+    menu = Catalogo.cargar(ruta).buscar("Completo")
+
+    assert dict(menu.ingredientes) == {"pan": MAX_CANTIDAD_RECETA, "agua": 0}
+
+
+def test_cargar_json_y_csv_dan_el_mismo_catalogo(tmp_path):
+    ruta_json = _catalogo_json(tmp_path, [
+        {"nombre": "Papas Fritas", "precio": 500, "ingredientes": {"Papas ": 5}, "icono": "papas.png"},
+        {"nombre": "Completo", "precio": 1800, "ingredientes": {"pan": 1, "vienesa": 1}},
+    ])
+    ruta_csv = tmp_path / "menus.csv"
+    ruta_csv.write_text(
+        "nombre,precio,ingredientes,icono\nPapas Fritas,500, Papas :5,papas.png\nCompleto,1800,pan:1;vienesa:1;,\n",
+        encoding="utf-8",
+    )
+
+    for catalogo in (Catalogo.cargar(ruta_json), Catalogo.cargar(str(ruta_csv))):
+        assert [(m.nombre, m.precio, dict(m.ingredientes), m.icono) for m in catalogo] == [
+            ("Papas Fritas", 500, {"papas": 5}, "papas.png"),
+            ("Completo", 1800, {"pan": 1, "vienesa": 1}, None),
+        ]
+
+
+def test_catalogo_incluido_se_carga():
+    catalogo = Catalogo.cargar()
+    assert len(catalogo) > 0
+    assert catalogo.buscar(catalogo[0].nombre) is catalogo[0]
+
+
+def test_indices_por_nombre_e_ingrediente():
+    completo = Menu("Completo", 1800, {"pan": 1, "vienesa": 1})
+    italiano = Menu("Italiano", 2000, {"pan": 1, "palta": 1})
+    papas = Menu("Papas Fritas", 500, {"papas": 5})
+    catalogo = Catalogo([completo, italiano, papas])
+
+    assert catalogo.buscar("Italiano") is italiano
+    assert catalogo.buscar("italiano") is None
+    assert catalogo.menus_con_ingrediente("pan") == [completo, italiano]
+    assert catalogo.menus_con_ingrediente("tomate") == []
+    assert catalogo.menus_afectados(["palta", "papas", "pan"]) == [italiano, papas, completo]
+    assert catalogo.filtrar(" PAPAS ") == [papas]
+    assert catalogo.filtrar("") == [completo, italiano, papas]
+
+    with pytest.raises(ValueError, match="ya está en el catálogo"):
+        catalogo.agregar(Menu("Completo", 1900, {}))
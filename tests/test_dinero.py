@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+import pytest
+
+from restaurante.dinero import calcular_iva, formatear, pesos
+from restaurante.modelos import Menu, Pedido
+
+
+@pytest.mark.parametrize("neto, iva", [
+    (0, 0),
+    (1, 0),        # 0,19
+    (2, 0),        # 0,38
+    (3, 1),        # 0,57
+    (50, 10),      # 9,5: la mitad sube
+    (150, 29),     # 28,5
+    (250, 48),     # 47,5
+    (2200, 418),   # exacto
+    (1_000_050, 190_010),  # 190.009,5
+])
+def test_iva_redondea_la_mitad_hacia_arriba(neto, iva):
+    assert calcular_iva(neto) == iva
+
+
+def test_iva_se_calcula_sobre_el_neto_del_pedido():
+    # Por línea serían 0 + 0 + 0 pesos de IVA; sobre el neto de 3 pesos es 1
+    pedido = Pedido()
+    for nombre in ("a", "b", "c"):
+        pedido.agregar_menu(Menu(nombre, 1, {}))
+    assert tuple(pedido.totales()) == (3, 1, 4)
+    pedido.eliminar_menu(pedido.buscar_linea("a").menu)
+    assert tuple(pedido.totales()) == (2, 0, 2)
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    (1100, 1100),
+    (0.5, 1),
+    (2.5, 3),          # sin redondeo bancario
+    (1099.49, 1099),
+    (Decimal("1990.5"), 1991),
+    ("1990.5", 1991),
+    ("1.100", 1100),
+    ("$12.345.678", 12345678),
+    ("1.100,5", 1101),
+    (" 1.5 ", 2),
+    ("-1.000", -1000),
+])
+def test_pesos(valor, esperado):
+    assert pesos(valor) == esperado
+
+
+@pytest.mark.parametrize("valor", ["abc", "", True, None])
+def test_pesos_rechaza_montos_invalidos(valor):
+    with pytest.raises(ValueError):
+        pesos(valor)
+
+
+@pytest.mark.parametrize("monto", [0, 5, 999, 1000, 1100, 1_234_567])
+def test_formatear_se_vuelve_a_leer_igual(monto):
+    assert pesos(formatear(monto)) == monto
@@ -0,0 +1,98 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from restaurante.catalogo import Catalogo
+from restaurante.disponibilidad import UMBRAL_VECTORIAL, Disponibilidad
+from restaurante.modelos import Ingrediente, Menu, Stock
+
+
+def _stock(**cantidades):
+    stock = Stock()
+    stock.agregar_lote([Ingrediente(nombre, cantidad) for nombre, cantidad in cantidades.items()])
+    return stock
+
+
+@pytest.fixture
+def disponibilidad():
+    catalogo = Catalogo([
+        Menu("Completo", 1800, {"pan": 1, "vienesa": 1}),
+        Menu("Papas Fritas", 500, {"papas": 5}),
+        Menu("Agua", 800, {}),
+    ])
+    return Disponibilidad(catalogo, _stock(pan=4, vienesa=2, papas=12))
+
+
+def test_porciones_iniciales(disponibilidad):
+    assert disponibilidad.porciones == {"Completo": 2, "Papas Fritas": 2, "Agua": None}
+    assert disponibilidad.porciones_de("Nada") == 0
+    assert disponibilidad.es_preparable("Agua")
+    assert disponibilidad.preparables() == ["Completo", "Papas Fritas", "Agua"]
+
+
+def test_cambios_del_stock_avisan_solo_los_menus_afectados(disponibilidad):
+    avisos = []
+    disponibilidad.suscribir(avisos.append)
+    stock = disponibilidad.stock
+    completo = disponibilidad.catalogo.buscar("Completo")
+
+    assert completo.preparar(stock)
+    assert completo.preparar(stock)
+    assert not completo.preparar(stock)
+    # Sumar pan no cambia las porciones: falta vienesa
+    stock.agregar_ingrediente(Ingrediente("pan", 10))
+    stock.eliminar_ingrediente("papas")
+
+    assert avisos == [{"Completo": 1}, {"Completo": 0}, {"Papas Fritas": 0}]
+    assert disponibilidad.preparables() == ["Agua"]
+
+
+def _catalogo_grande(azar, ingredientes, menus=80):
+    return Catalogo(
+        Menu(f"menu {i}", 1000, {nombre: azar.randint(0, 4) for nombre in azar.sample(ingredientes, azar.randint(0, 4))})
+        for i in range(menus)
+    )
+
+
+def test_matriz_da_lo_mismo_que_el_calculo_por_menu():
+    pytest.importorskip("numpy")
+    azar = random.Random(7)
+    ingredientes = [f"ingrediente {i}" for i in range(30)]
+    catalogo = _catalogo_grande(azar, ingredientes)
+    stock = _stock(**{nombre: azar.randint(0, 50) for nombre in ingredientes})
+    assert len(catalogo) >= UMBRAL_VECTORIAL
+
+    disponibilidad = Disponibilidad(catalogo, stock)
+    assert disponibilidad._matriz is not None
+
+    def por_menu():
+        return {menu.nombre: disponibilidad._calcular(menu) for menu in catalogo}
+
+    assert disponibilidad.porciones == por_menu()
+    # Una guía de despacho cambia casi todo de una vez; un consumo, pocos menús
+    stock.agregar_lote([Ingrediente(nombre, azar.randint(0, 20)) for nombre in ingredientes])
+    assert disponibilidad.porciones == por_menu()
+    for menu in azar.sample(list(catalogo), 20):
+        menu.preparar(stock)
+    assert disponibilidad.porciones == por_menu()
+
+
+def test_sin_numpy_se_calcula_por_menu(monkeypatch):
+    matriz = pytest.importorskip("restaurante.matriz")
+    monkeypatch.setattr(matriz, "np", None)
+    azar = random.Random(3)
+    ingredientes = [f"ingrediente {i}" for i in range(10)]
+    catalogo = _catalogo_grande(azar, ingredientes)
+    stock = _stock(**{nombre: 10 for nombre in ingredientes})
+
+    disponibilidad = Disponibilidad(catalogo, stock)
+
+    assert disponibilidad._matriz is None
+    assert disponibilidad.porciones == {menu.nombre: disponibilidad._calcular(menu) for menu in catalogo}
+
+
+def test_importar_disponibilidad_no_carga_numpy():
+    codigo = "import sys, restaurante.disponibilidad; sys.exit('numpy' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", codigo]).returncode == 0
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from restaurante import importacion
+from restaurante.importacion import importar_manifiesto, leer_manifiesto
+from restaurante.modelos import Ingrediente, Stock
+
+
+def _filas(cantidad):
+    # Nombres de largo variable para que los objetos caigan en cualquier punto del bloque
+    return [{"nombre": f"ingrediente {i} " + "x" * (i % 37), "cantidad": i + 1} for i in range(cantidad)]
+
+
+def _escribir_json(ruta, filas, separador=", "):
+    ruta.write_text("[" + separador.join(json.dumps(fila, ensure_ascii=False) for fila in filas) + "]",
+                    encoding="utf-8")
+
+
+def test_json_con_objetos_cortados_entre_bloques(tmp_path):
+    ruta = tmp_path / "guia.json"
+    filas = _filas(3000)
+    _escribir_json(ruta, filas, separador=",\n  ")
+    texto = ruta.read_text(encoding="utf-8")
+    assert len(texto) > 2 * importacion.TAMANO_BLOQUE
+    # Algún objeto queda partido en el límite del primer bloque
+    assert texto.rfind("{", 0, importacion.TAMANO_BLOQUE) > texto.rfind("}", 0, importacion.TAMANO_BLOQUE)
+
+    leidos = list(leer_manifiesto(str(ruta)))
+
+    assert [(i.nombre, i.cantidad) for i in leidos] == [
+        (Ingrediente(fila["nombre"], 1).nombre, fila["cantidad"]) for fila in filas
+    ]
+
+
+@pytest.mark.parametrize("tamano_bloque", [1, 7, 64, 1000])
+def test_json_con_bloques_chicos(tmp_path, monkeypatch, tamano_bloque):
+    monkeypatch.setattr(importacion, "TAMANO_BLOQUE", tamano_bloque)
+    ruta = tmp_path / "guia.json"
+    filas = _filas(50)
+    _escribir_json(ruta, filas)
+
+    leidos = list(leer_manifiesto(str(ruta)))
+
+    assert [i.cantidad for i in leidos] == [fila["cantidad"] for fila in filas]
+
+
+def test_json_incompleto(tmp_path):
+    ruta = tmp_path / "guia.json"
+    ruta.write_text('[{"nombre": "pan", "cantidad": 3}, {"nombre": "pa', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="incompleto"):
+        list(leer_manifiesto(str(ruta)))
+
+
+@pytest.mark.parametrize("archivo, contenido", [
+    ("guia.csv", "nombre,cantidad\npan,10\npalta,5\ntomate,muchos\n"),
+    ("guia.jsonl", '{"nombre": "pan", "cantidad": 10}\n{"nombre": "palta", "cantidad": 5}\n'
+                   '{"nombre": "tomate", "cantidad": -2}\n'),
+    ("guia.json", '[{"nombre": "pan", "cantidad": 10}, {"nombre": "palta", "cantidad": 5}, {"nombre": "tomate"}]'),
+])
+def test_linea_invalida_no_modifica_el_stock(tmp_path, archivo, contenido):
+    ruta = tmp_path / archivo
+    ruta.write_text(contenido, encoding="utf-8")
+    stock = Stock()
+    stock.agregar_ingrediente(Ingrediente("pan", 1))
+    avisos = []
+    stock.suscribir(avisos.append)
+
+    with pytest.raises(ValueError, match="Línea"):
+        importar_manifiesto(stock, str(ruta))
+
+    assert stock.ingredientes == {"pan": 1}
+    assert avisos == []
+
+
+def test_importar_suma_repetidos(tmp_path):
+    ruta = tmp_path / "guia.csv"
+    ruta.write_text("nombre,cantidad\nPan ,10\npan,5\npalta,2\n", encoding="utf-8")
+    stock = Stock()
+
+    agregados = importar_manifiesto(stock, str(ruta))
+
+    assert agregados == {"pan": 15, "palta": 2}
+    assert stock.ingredientes == {"pan": 15, "palta": 2}
+
+
+@pytest.mark.parametrize("archivo, contenido", [
+    ("guia.json", '[{"nombre": "pan", "cantidad": 2.9}]'),
+    ("guia.json", '[{"nombre": "pan", "cantidad": 3.0}]'),
+    ("guia.json", '[{"nombre": "pan", "cantidad": true}]'),
+    ("guia.json", '[{"nombre": "pan", "cantidad": "3"}]'),
+    ("guia.jsonl", '{"nombre": "pan", "cantidad": 1e2}\n'),
+    ("guia.csv", "nombre,cantidad\npan,2.9\n"),
+    ("guia.csv", "nombre,cantidad\npan,1_000\n"),
+    ("guia.csv", "nombre,cantidad\npan,+3\n"),
+    ("guia.csv", "nombre,cantidad\npan,\n"),
+])
+def test_cantidad_debe_ser_entera(tmp_path, archivo, contenido):
+    ruta = tmp_path / archivo
+    ruta.write_text(contenido, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Línea 1|Línea 2"):
+        list(leer_manifiesto(str(ruta)))
+
+
+def test_csv_acepta_espacios_alrededor_de_la_cantidad(tmp_path):
+    ruta = tmp_path / "guia.csv"
+    ruta.write_text("nombre,cantidad\npan, 12 \n", encoding="utf-8")
+
+    assert [(i.nombre, i.cantidad) for i in leer_manifiesto(str(ruta))] == [("pan", 12)]
@@ -0,0 +1,143 @@
+import random
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from restaurante.modelos import Ingrediente, Menu
+from restaurante.persistencia import MAX_REINTENTOS, Diario
+
+
+def _recargar(ruta):
+    diario = Diario(ruta)
+    try:
+        return dict(diario.cargar().ingredientes)
+    finally:
+        diario.cerrar(instantanea=False)
+
+
+def test_instantanea_y_eventos_reconstruyen_el_stock(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta)
+    stock = diario.cargar()
+    stock.agregar_lote([Ingrediente("pan", 20), Ingrediente("vienesa", 10), Ingrediente("palta", 4)])
+    completo = Menu("Completo", 1800, {"pan": 1, "vienesa": 1, "palta": 1})
+    completo.preparar(stock)
+    diario.instantanea()
+    # Cambios posteriores a la instantánea, que se aplican al reconstruir
+    completo.preparar(stock)
+    stock.agregar_ingrediente(Ingrediente("tomate", 7))
+    stock.eliminar_ingrediente("palta")
+    esperado = dict(stock.ingredientes)
+    diario.cerrar(instantanea=False)
+
+    assert _recargar(ruta) == esperado
+
+
+def test_reconstruir_sin_instantanea_y_despues_de_compactar(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta)
+    stock = diario.cargar()
+    for cantidad in range(1, 50):
+        stock.agregar_ingrediente(Ingrediente("papas", cantidad))
+    esperado = dict(stock.ingredientes)
+    diario.cerrar(instantanea=False)
+    assert _recargar(ruta) == esperado
+
+    # Al cerrar con instantánea los eventos se compactan y el resultado es el mismo
+    diario = Diario(ruta)
+    diario.cargar()
+    diario.cerrar()
+    assert _recargar(ruta) == esperado
+
+
+def test_cambios_concurrentes_se_reconstruyen_iguales(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta)
+    stock = diario.cargar()
+    nombres = [f"ingrediente {i}" for i in range(4)]
+    stock.agregar_lote([Ingrediente(nombre, 5000) for nombre in nombres])
+    menus = [Menu(f"menu {i}", 1000, {nombres[i]: 1, nombres[(i + 1) % 4]: 2}) for i in range(4)]
+
+    def caja(semilla):
+        azar = random.Random(semilla)
+        for _ in range(500):
+            menu = azar.choice(menus)
+            if menu.preparar(stock) and azar.random() < 0.3:
+                stock.devolver(menu.ingredientes)
+
+    cajas = [threading.Thread(target=caja, args=(semilla,)) for semilla in range(6)]
+    for hilo in cajas:
+        hilo.start()
+    for hilo in cajas:
+        hilo.join()
+    esperado = dict(stock.ingredientes)
+    diario.cerrar(instantanea=False)
+
+    assert _recargar(ruta) == esperado
+
+
+class _BaseBloqueada:
+    # Reemplaza Diario._escribir y falla mientras bloqueada sea verdadero
+    def __init__(self, diario, bloqueada=True):
+        self.escribir = diario._escribir
+        self.bloqueada = bloqueada
+        self.fallos = 0
+
+    def __call__(self, pendientes, ventas=()):
+        if self.bloqueada and (pendientes or ventas):
+            self.fallos += 1
+            raise sqlite3.OperationalError("database is locked")
+        self.escribir(pendientes, ventas)
+
+
+def _esperar(condicion):
+    limite = time.monotonic() + 5
+    while not condicion():
+        assert time.monotonic() < limite
+        time.sleep(0.001)
+
+
+def test_fallo_de_escritura_se_reintenta(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta, intervalo_commit=0.001)
+    stock = diario.cargar()
+    base = diario._escribir = _BaseBloqueada(diario)
+    stock.agregar_ingrediente(Ingrediente("pan", 3))
+    _esperar(lambda: base.fallos >= 2)
+
+    base.bloqueada = False
+    stock.agregar_ingrediente(Ingrediente("pan", 2))
+    diario.cerrar(instantanea=False)
+
+    assert _recargar(ruta) == {"pan": 5}
+
+
+def test_registrar_falla_si_la_base_no_se_recupera(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta, intervalo_commit=0.001)
+    stock = diario.cargar()
+    base = diario._escribir = _BaseBloqueada(diario)
+    stock.agregar_ingrediente(Ingrediente("pan", 3))
+    _esperar(lambda: base.fallos >= MAX_REINTENTOS)
+
+    with pytest.raises(RuntimeError, match="no puede escribir"):
+        diario.registrar("prueba", {})
+
+    # Al recuperarse se escribe todo lo que quedó en cola, y registrar vuelve a funcionar
+    base.bloqueada = False
+    _esperar(lambda: diario._error is None)
+    stock.agregar_ingrediente(Ingrediente("pan", 2))
+    diario.cerrar(instantanea=False)
+    assert _recargar(ruta) == {"pan": 5}
+
+
+def test_cerrar_avisa_si_no_pudo_escribir(tmp_path):
+    diario = Diario(str(tmp_path / "restaurante.db"), intervalo_commit=60)
+    stock = diario.cargar()
+    diario._escribir = _BaseBloqueada(diario)
+    stock.agregar_ingrediente(Ingrediente("pan", 3))
+
+    with pytest.raises(sqlite3.OperationalError):
+        diario.cerrar(instantanea=False)
@@ -0,0 +1,97 @@
+import pytest
+
+from restaurante.modelos import Ingrediente, Menu, Pedido, Stock
+from restaurante.sesiones import Sesion
+
+
+def _stock(**cantidades):
+    stock = Stock()
+    stock.agregar_lote([Ingrediente(nombre, cantidad) for nombre, cantidad in cantidades.items()])
+    return stock
+
+
+def test_reservar_descuenta_todo_el_pedido_o_nada():
+    stock = _stock(pan=3, vienesa=1)
+    completo = Menu("Completo", 1800, {"pan": 1, "vienesa": 1})
+    pedido = Pedido()
+    pedido.agregar_menu(completo, 2)
+
+    assert stock.reservar(pedido) is None
+    assert stock.ingredientes == {"pan": 3, "vienesa": 1}
+
+    pedido.eliminar_menu(completo)
+    reserva = stock.reservar(pedido)
+    assert stock.ingredientes == {"pan": 2, "vienesa": 0}
+    reserva.cancelar()
+    assert stock.ingredientes == {"pan": 3, "vienesa": 1}
+    # Cancelar dos veces no devuelve nada de más
+    reserva.cancelar()
+    assert stock.ingredientes == {"pan": 3, "vienesa": 1}
+
+
+def test_devolver_menu_de_la_reserva():
+    stock = _stock(pan=5, palta=5)
+    palta = Menu("Palta", 900, {"pan": 1, "palta": 2})
+    sesion = Sesion("Mesa 1", stock)
+    assert sesion.agregar_menu(palta, 2)
+    assert stock.ingredientes == {"pan": 3, "palta": 1}
+    assert not sesion.agregar_menu(palta)
+
+    sesion.eliminar_menu(palta)
+    assert stock.ingredientes == {"pan": 4, "palta": 3}
+    assert sesion.pedido.buscar_linea("Palta").cantidad == 1
+
+    with pytest.raises(ValueError):
+        sesion.eliminar_menu(palta, 2)
+    assert sesion.pedido.buscar_linea("Palta").cantidad == 1
+    assert sesion.reserva.cantidades == {"pan": 1, "palta": 2}
+
+
+def test_fallo_de_la_reserva_no_cambia_el_pedido():
+    stock = _stock(pan=5)
+    sesion = Sesion("Mesa 1", stock)
+    menu = Menu("Pan", 500, {"pan": 1})
+    sesion.agregar_menu(menu, 2)
+    # La reserva perdió una unidad (por ejemplo la devolvió otra caja)
+    sesion.reserva.devolver_menu(menu)
+
+    with pytest.raises(ValueError):
+        sesion.eliminar_menu(menu, 2)
+    assert sesion.pedido.buscar_linea("Pan").cantidad == 2
+    assert stock.ingredientes == {"pan": 4}
+
+
+def test_ingredientes_con_cantidad_cero():
+    stock = _stock(pan=2)
+    menu = Menu("Pan con agua", 600, {"pan": 1, "agua": 0})
+    sesion = Sesion("Mesa 1", stock)
+
+    assert sesion.agregar_menu(menu)
+    assert sesion.agregar_menu(menu)
+    assert stock.ingredientes == {"pan": 0}
+    sesion.eliminar_menu(menu)
+    sesion.eliminar_menu(menu)
+    assert stock.ingredientes == {"pan": 2}
+    assert sesion.pedido.lineas == {}
+
+
+@pytest.mark.parametrize("cantidad", [0, -3])
+def test_cantidades_no_positivas(cantidad):
+    stock = _stock(pan=5)
+    menu = Menu("Pan", 500, {"pan": 1})
+    sesion = Sesion("Mesa 1", stock)
+    sesion.agregar_menu(menu)
+
+    with pytest.raises(ValueError):
+        sesion.agregar_menu(menu, cantidad)
+    with pytest.raises(ValueError):
+        sesion.eliminar_menu(menu, cantidad)
+    with pytest.raises(ValueError):
+        stock.consumir(menu.ingredientes, cantidad)
+    with pytest.raises(ValueError):
+        sesion.pedido.agregar_menu(menu, cantidad)
+    with pytest.raises(ValueError):
+        sesion.pedido.eliminar_menu(menu, cantidad)
+    assert stock.ingredientes == {"pan": 4}
+    assert sesion.pedido.buscar_linea("Pan").cantidad == 1
+    assert sesion.reserva.cantidades == {"pan": 1}
@@ -0,0 +1,119 @@
+import http.client
+import json
+import socket
+
+import pytest
+
+from restaurante.catalogo import Catalogo
+from restaurante.modelos import Ingrediente, Menu, Stock
+from restaurante.servidor import Servidor
+
+
+def _puerto_libre():
+    with socket.socket() as conexion:
+        conexion.bind(("127.0.0.1", 0))
+        return conexion.getsockname()[1]
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    # Las boletas se escriben en el directorio actual
+    monkeypatch.chdir(tmp_path)
+    stock = Stock()
+    stock.agregar_lote([Ingrediente("pan", 4), Ingrediente("vienesa", 2)])
+    catalogo = Catalogo([
+        Menu("Completo", 1800, {"pan": 1, "vienesa": 1}),
+        Menu("Pan", 500, {"pan": 1}),
+    ])
+    servidor = Servidor(stock, catalogo, puerto=_puerto_libre(), tiempo_espera=2)
+    servidor.iniciar_en_hilo()
+    for _ in range(200):
+        try:
+            socket.create_connection((servidor.host, servidor.puerto), timeout=0.05).close()
+            break
+        except OSError:
+            pass
+    yield servidor
+    servidor.detener()
+    servidor.generador_boletas.cerrar()
+
+
+def _pedir(servidor, metodo, ruta, cuerpo=None, encabezados=None):
+    conexion = http.client.HTTPConnection(servidor.host, servidor.puerto, timeout=5)
+    try:
+        if cuerpo is not None and not isinstance(cuerpo, bytes):
+            cuerpo = json.dumps(cuerpo).encode("utf-8")
+        conexion.request(metodo, ruta, body=cuerpo, headers=encabezados or {})
+        respuesta = conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read())
+    finally:
+        conexion.close()
+
+
+def test_menus_y_stock(servidor):
+    estado, menus = _pedir(servidor, "GET", "/menus")
+    assert estado == 200
+    assert {menu["nombre"]: menu["porciones"] for menu in menus} == {"Completo": 2, "Pan": 4}
+
+    assert _pedir(servidor, "GET", "/stock") == (200, {"pan": 4, "vienesa": 2})
+    assert _pedir(servidor, "GET", "/stock/Pan") == (200, {"nombre": "pan", "cantidad": 4})
+    assert _pedir(servidor, "GET", "/stock/palta")[0] == 404
+    assert _pedir(servidor, "GET", "/nada")[0] == 404
+
+
+def test_crear_consultar_y_anular_pedido(servidor):
+    estado, pedido = _pedir(servidor, "POST", "/pedidos", {"lineas": [{"menu": "Completo", "cantidad": 2}]})
+    assert estado == 201
+    assert pedido["totales"] == {"subtotal": 3600, "iva": 684, "total": 4284}
+    assert servidor.stock.ingredientes == {"pan": 2, "vienesa": 0}
+
+    assert _pedir(servidor, "GET", f"/pedidos/{pedido['id']}") == (200, pedido)
+
+    estado, error = _pedir(servidor, "POST", "/pedidos", {"lineas": [{"menu": "Completo"}]})
+    assert estado == 409
+    assert error["faltantes"] == {"vienesa": 1}
+
+    assert _pedir(servidor, "DELETE", f"/pedidos/{pedido['id']}") == (200, {"id": pedido["id"], "anulado": True})
+    assert servidor.stock.ingredientes == {"pan": 4, "vienesa": 2}
+    assert _pedir(servidor, "GET", f"/pedidos/{pedido['id']}")[0] == 404
+
+
+def test_boleta_cierra_el_pedido(servidor, tmp_path):
+    _, pedido = _pedir(servidor, "POST", "/pedidos", {"lineas": [{"menu": "Pan", "cantidad": 3}]})
+
+    assert _pedir(servidor, "POST", f"/pedidos/{pedido['id']}/boleta?formato=bmp")[0] == 400
+    estado, boleta = _pedir(servidor, "POST", f"/pedidos/{pedido['id']}/boleta?formato=texto")
+
+    assert estado == 200
+    assert "Pan" in (tmp_path / boleta["boleta"]).read_text(encoding="utf-8")
+    assert _pedir(servidor, "POST", f"/pedidos/{pedido['id']}/boleta?formato=texto")[0] == 404
+    # Cobrado, el stock no vuelve
+    assert servidor.stock.ingredientes == {"pan": 1, "vienesa": 2}
+
+
+@pytest.mark.parametrize("cuerpo", [
+    b"no es json",
+    {},
+    {"lineas": []},
+    {"lineas": 5},
+    {"lineas": "Pan"},
+    {"lineas": [5]},
+    {"lineas": [{"menu": ["Pan"]}]},
+    {"lineas": [{"menu": "Palta"}]},
+    {"lineas": [{"menu": "Pan", "cantidad": 0}]},
+    {"lineas": [{"menu": "Pan", "cantidad": True}]},
+    {"lineas": [{"menu": "Pan", "cantidad": 1.5}]},
+])
+def test_pedido_invalido(servidor, cuerpo):
+    estado, _ = _pedir(servidor, "POST", "/pedidos", cuerpo)
+    assert estado == 400
+    assert servidor.stock.ingredientes == {"pan": 4, "vienesa": 2}
+    assert len(servidor.sesiones) == 0
+
+
+@pytest.mark.parametrize("largo", ["-1", "abc"])
+def test_content_length_invalido(servidor, largo):
+    with socket.create_connection((servidor.host, servidor.puerto), timeout=5) as conexion:
+        conexion.sendall(f"POST /pedidos HTTP/1.1\r\nContent-Length: {largo}\r\n\r\n".encode("latin-1"))
+        respuesta = conexion.makefile("rb").readline()
+    assert respuesta.startswith(b"HTTP/1.1 400")
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from restaurante.modelos import Ingrediente, Menu, Pedido, Stock
+from restaurante.sesiones import GestorSesiones
+
+PAN = Menu("Pan", 500, {"pan": 1})
+
+
+def _gestor(pan):
+    stock = Stock()
+    stock.agregar_ingrediente(Ingrediente("pan", pan))
+    return GestorSesiones(stock)
+
+
+def test_abrir_con_pedido_reserva_o_no_abre():
+    gestor = _gestor(3)
+    pedido = Pedido()
+    pedido.agregar_menu(PAN, 4)
+    assert gestor.abrir("ticket-1", pedido) is None
+    assert "ticket-1" not in gestor
+
+    pedido.eliminar_menu(PAN, 2)
+    assert gestor.abrir("ticket-1", pedido) is not None
+    assert gestor.stock.ingredientes == {"pan": 1}
+    with pytest.raises(ValueError):
+        gestor.abrir("ticket-1")
+
+
+def test_cerrar_archiva_y_anular_devuelve_el_stock():
+    gestor = _gestor(10)
+    gestor.cambiar("Mesa 1").agregar_menu(PAN, 2)
+    gestor.cambiar("Mesa 2").agregar_menu(PAN, 3)
+    assert gestor.actual.clave == "Mesa 2"
+
+    cobrado = gestor.cerrar("Mesa 1")
+    anulado = gestor.cerrar("Mesa 2", anular=True)
+
+    assert gestor.actual is None
+    assert len(gestor) == 0
+    assert gestor.stock.ingredientes == {"pan": 8}
+    assert (cobrado.anulado, cobrado.datos.totales.subtotal) == (False, 1000)
+    assert (anulado.anulado, anulado.datos.totales.subtotal) == (True, 1500)
+    assert gestor.archivados() == [cobrado, anulado]
+    with pytest.raises(KeyError):
+        gestor.cerrar("Mesa 1")
+
+
+def test_sesion_cerrada_no_descuenta_stock():
+    gestor = _gestor(5)
+    sesion = gestor.cambiar("Mostrador")
+    sesion.agregar_menu(PAN)
+    gestor.cerrar("Mostrador")
+
+    with pytest.raises(ValueError, match="cerrado"):
+        sesion.agregar_menu(PAN)
+    with pytest.raises(ValueError, match="cerrado"):
+        sesion.eliminar_menu(PAN)
+    assert gestor.stock.ingredientes == {"pan": 4}
+
+
+def test_anular_abiertas_devuelve_todo():
+    gestor = _gestor(10)
+    for clave in ("Mostrador", "Mesa 1", "ticket-1"):
+        gestor.cambiar(clave).agregar_menu(PAN, 2)
+
+    archivados = gestor.anular_abiertas()
+
+    assert [archivado.clave for archivado in archivados] == ["Mostrador", "Mesa 1", "ticket-1"]
+    assert all(archivado.anulado for archivado in archivados)
+    assert gestor.abiertas() == []
+    assert gestor.stock.ingredientes == {"pan": 10}
+
+
+def test_cerrar_mientras_otro_hilo_agrega():
+    # Lo que quedó en el pedido archivado es justo lo que salió del stock
+    for _ in range(20):
+        gestor = _gestor(10_000)
+        sesion = gestor.cambiar("Mostrador")
+        listo = threading.Event()
+
+        def caja():
+            listo.set()
+            while True:
+                try:
+                    sesion.agregar_menu(PAN)
+                except ValueError:
+                    return
+
+        hilo = threading.Thread(target=caja)
+        hilo.start()
+        listo.wait()
+        archivado = gestor.cerrar("Mostrador")
+        hilo.join()
+
+        vendidos = sum(linea.cantidad for linea in archivado.datos.lineas)
+        assert gestor.stock.ingredientes == {"pan": 10_000 - vendidos}
+        assert sesion.pedido.datos_boleta() == archivado.datos
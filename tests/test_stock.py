@@ -0,0 +1,68 @@
+import random
+import threading
+
+from restaurante.modelos import Ingrediente, Menu, Stock
+
+
+def test_candados_se_toman_en_orden_y_sin_repetir():
+    stock = Stock()
+    nombres = [f"ingrediente {i}" for i in range(200)]
+
+    candados = stock._bloquear(nombres).candados
+
+    indices = [stock._candados.index(candado) for candado in candados]
+    assert indices == sorted(set(indices))
+    assert len(indices) == len({hash(nombre) % Stock.N_CANDADOS for nombre in nombres})
+    with stock._bloquear(nombres):
+        assert all(candado.locked() for candado in candados)
+    assert not any(candado.locked() for candado in stock._candados)
+
+
+def test_nunca_se_vende_mas_de_lo_que_hay():
+    stock = Stock()
+    stock.agregar_lote([Ingrediente("pan", 1000), Ingrediente("vienesa", 600), Ingrediente("palta", 700)])
+    completo = Menu("Completo", 1800, {"pan": 1, "vienesa": 1})
+    italiano = Menu("Italiano", 2000, {"pan": 1, "palta": 1})
+    vendidos = {"Completo": 0, "Italiano": 0}
+    candado = threading.Lock()
+
+    def caja(semilla):
+        azar = random.Random(semilla)
+        for _ in range(400):
+            menu = azar.choice((completo, italiano))
+            if menu.preparar(stock):
+                with candado:
+                    vendidos[menu.nombre] += 1
+
+    hilos = [threading.Thread(target=caja, args=(semilla,)) for semilla in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert vendidos["Completo"] + vendidos["Italiano"] == 1000
+    assert stock.ingredientes == {
+        "pan": 0, "vienesa": 600 - vendidos["Completo"], "palta": 700 - vendidos["Italiano"],
+    }
+
+
+def test_consumir_y_devolver_en_paralelo_sin_deadlock():
+    # Recetas que comparten ingredientes en órdenes distintos
+    nombres = [f"ingrediente {i}" for i in range(12)]
+    stock = Stock()
+    stock.agregar_lote([Ingrediente(nombre, 100) for nombre in nombres])
+
+    def caja(semilla):
+        azar = random.Random(semilla)
+        for _ in range(500):
+            receta = {nombre: azar.randint(1, 3) for nombre in azar.sample(nombres, 4)}
+            if stock.consumir(receta):
+                stock.devolver(receta)
+
+    hilos = [threading.Thread(target=caja, args=(semilla,), daemon=True) for semilla in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(timeout=30)
+    assert not any(hilo.is_alive() for hilo in hilos)
+    assert stock.ingredientes == {nombre: 100 for nombre in nombres}
@@ -0,0 +1,21 @@
+from restaurante.modelos import Menu, Pedido
+from restaurante.persistencia import Diario
+from restaurante.ventas import LibroVentas
+
+
+def test_pedidos_quedan_en_el_libro_de_ventas(tmp_path):
+    ruta = str(tmp_path / "restaurante.db")
+    diario = Diario(ruta)
+    diario.cargar()
+    pedido = Pedido()
+    pedido.agregar_menu(Menu("Pepsi", 1100, {}), 2)
+    pedido.agregar_menu(Menu("Completo", 1800, {}))
+    diario.registrar_pedido(pedido)
+    diario.cerrar()
+
+    libro = LibroVentas(ruta)
+    try:
+        assert libro.resumen() == {"pedidos": 1, "subtotal": 4000, "iva": 760, "total": 4760}
+        assert libro.unidades_por_menu() == [("Pepsi", 2, 2200), ("Completo", 1, 1800)]
+    finally:
+        libro.cerrar()